@@ -0,0 +1,149 @@
+"""Gemini Batch API runner for non-interactive pitch analyses."""
+
+import json
+import logging
+import os
+import tempfile
+import time
+from typing import Any, Dict, List, Optional, Tuple
+import google.generativeai as genai
+from src.config import config
+from src.models import PitchAnalysisResult
+from src.pitch_analyzer import PitchAnalyzer, _PitchScanContext, _COMBINED_ANALYSIS_SCHEMA
+from src.response_cache import ResponseCache
+
+try:
+    from google import genai as genai_batch
+except ImportError:
+    genai_batch = None
+
+logger = logging.getLogger(__name__)
+
+_DONE_STATES = {"JOB_STATE_SUCCEEDED", "JOB_STATE_FAILED", "JOB_STATE_CANCELLED", "JOB_STATE_EXPIRED"}
+
+def _schema_dict(schema: "genai.protos.Schema") -> Dict[str, Any]:
+    """Convert a genai.protos.Schema into the JSON form used in batch request files."""
+    out: Dict[str, Any] = {"type": genai.protos.Type(schema.type).name}
+    if schema.properties:
+        out["properties"] = {name: _schema_dict(prop) for name, prop in schema.properties.items()}
+    if schema.type == genai.protos.Type.ARRAY:
+        out["items"] = _schema_dict(schema.items)
+    if schema.required:
+        out["required"] = list(schema.required)
+    return out
+
+class BatchAnalyzer:
+    """Runs many pitch analyses as one Gemini batch job, for work that can wait minutes or hours.
+    
+    Interactive analyses stay on PitchAnalyzer; batch jobs trade latency for half the per-token price.
+    Results are assembled by the instance that submitted the job.
+    """
+    
+    def __init__(self):
+        """Initialize the batch client and the analyzer used to build prompts and results."""
+        if not config.GOOGLE_API_KEY:
+            raise ValueError("Google API key not found.")
+        if genai_batch is None:
+            raise ImportError("The Gemini Batch API needs google-genai: pip install google-genai")
+        
+        self.client = genai_batch.Client(api_key=config.GOOGLE_API_KEY)
+        self.analyzer = PitchAnalyzer()
+        # job name -> (cache key, prepared pitch, mode) per submitted pitch, in order
+        self._jobs: Dict[str, List[Tuple[str, str, str]]] = {}
+    
+    def submit_batch(self, pitches: List[str], mode: str = "expert", source_type: str = "text") -> str:
+        """Upload one combined-analysis request per pitch and start a batch job; returns the job name."""
+        generation_config = {
+            "response_mime_type": "application/json",
+            "response_schema": _schema_dict(_COMBINED_ANALYSIS_SCHEMA),
+            "temperature": 0.2
+        }
+        task = self.analyzer._combined_task()
+        
+        entries = []
+        with tempfile.NamedTemporaryFile("w", suffix=".jsonl", delete=False, encoding="utf-8") as requests_file:
+            for i, pitch_content in enumerate(pitches):
+                prepared = self.analyzer._prepare_pitch(pitch_content, source_type)
+                entries.append((ResponseCache.make_key(pitch_content, mode, source_type), prepared, mode))
+                
+                # Pitches too thin for Gemini get a heuristic-only result, as on the interactive path
+                if self.analyzer._gate_reason(_PitchScanContext(prepared)):
+                    continue
+                
+                requests_file.write(json.dumps({
+                    "key": str(i),
+                    "request": {
+                        "contents": [{
+                            "role": "user",
+                            "parts": [{"text": self.analyzer._pitch_prefix(prepared) + task}]
+                        }],
+                        "generation_config": generation_config
+                    }
+                }) + "\n")
+            path = requests_file.name
+        
+        try:
+            uploaded = self.client.files.upload(file=path, config={"mime_type": "jsonl"})
+        finally:
+            os.remove(path)
+        
+        job = self.client.batches.create(
+            model=config.BATCH_MODEL_NAME,
+            src=uploaded.name,
+            config={"display_name": f"pitchos-{len(pitches)}-pitches"}
+        )
+        self._jobs[job.name] = entries
+        return job.name
+    
+    def get_batch_status(self, job_name: str) -> str:
+        """Return the job state, e.g. JOB_STATE_RUNNING or JOB_STATE_SUCCEEDED."""
+        return self.client.batches.get(name=job_name).state.name
+    
+    def retrieve_batch_results(self, job_name: str) -> List[PitchAnalysisResult]:
+        """Download a finished job's responses and assemble one result per pitch, in submission order."""
+        job = self.client.batches.get(name=job_name)
+        if job.state.name != "JOB_STATE_SUCCEEDED":
+            raise RuntimeError(f"Batch job {job_name} is {job.state.name}")
+        
+        texts = {}
+        for line in self.client.files.download(file=job.dest.file_name).decode("utf-8").splitlines():
+            if not line.strip():
+                continue
+            row = json.loads(line)
+            try:
+                texts[row["key"]] = row["response"]["candidates"][0]["content"]["parts"][0]["text"]
+            except (KeyError, IndexError, TypeError):
+                logger.warning("Batch request %s failed: %s", row.get("key"), row.get("error"))
+        
+        return [
+            self._build_result(cache_key, pitch_content, mode, texts.get(str(i), ""))
+            for i, (cache_key, pitch_content, mode) in enumerate(self._jobs.pop(job_name))
+        ]
+    
+    def analyze_many(self, pitches: List[str], mode: str = "expert", source_type: str = "text",
+                     poll_interval: Optional[float] = None) -> List[PitchAnalysisResult]:
+        """Submit pitches as one batch job and block until its results are ready."""
+        job_name = self.submit_batch(pitches, mode, source_type)
+        while self.get_batch_status(job_name) not in _DONE_STATES:
+            time.sleep(poll_interval or config.BATCH_POLL_INTERVAL_SECONDS)
+        return self.retrieve_batch_results(job_name)
+    
+    def _build_result(self, cache_key: str, pitch_content: str, mode: str, text: str) -> PitchAnalysisResult:
+        """Assemble a result from one response, filling failed sections locally instead of re-requesting."""
+        analyzer = self.analyzer
+        ctx = _PitchScanContext(pitch_content)
+        deck_summary, investor_simulations, vc_qa_battle = analyzer._parse_combined(text)
+        complete = None not in (deck_summary, investor_simulations, vc_qa_battle)
+        
+        result = analyzer._assemble_result(
+            ctx, mode,
+            deck_summary or analyzer._basic_element_extraction(pitch_content),
+            investor_simulations or [analyzer._get_fallback_reaction(p) for p in config.INVESTOR_PERSONAS],
+            vc_qa_battle or analyzer._get_fallback_qa_battle(),
+            analyzer._scan_heuristics(ctx)
+        )
+        
+        # Later interactive submissions of the same pitch are served from the cache
+        if complete:
+            analyzer._response_cache.put(cache_key, result)
+        return result
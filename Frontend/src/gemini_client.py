@@ -0,0 +1,63 @@
+"""Shared Gemini client setup for PitchOS."""
+
+import asyncio
+import functools
+import threading
+from datetime import timedelta
+from typing import Any, Awaitable, List, Optional
+import google.generativeai as genai
+from src.config import config
+
+_configure_lock = threading.Lock()
+_configured = False
+
+_loop_lock = threading.Lock()
+_loop: Optional[asyncio.AbstractEventLoop] = None
+
+def configure_gemini() -> None:
+    """Configure the genai SDK once per process.
+    
+    Calling genai.configure again drops the SDK's cached service clients, and
+    with them the open connections, so every component goes through here.
+    """
+    global _configured
+    with _configure_lock:
+        if not _configured:
+            genai.configure(api_key=config.GOOGLE_API_KEY, transport=config.GEMINI_TRANSPORT)
+            _configured = True
+
+def run_async(coro: Awaitable[Any]) -> Any:
+    """Run coro on the shared background event loop and wait for its result.
+    
+    The SDK's async gRPC channel is bound to the loop it was opened on, so
+    sync entry points share one long-lived loop instead of asyncio.run, which
+    would tear the channel and its connection down after every call.
+    """
+    global _loop
+    with _loop_lock:
+        if _loop is None:
+            _loop = asyncio.new_event_loop()
+            threading.Thread(target=_loop.run_forever, name="gemini-event-loop", daemon=True).start()
+    return asyncio.run_coroutine_threadsafe(coro, _loop).result()
+
+@functools.lru_cache(maxsize=4)
+def get_model(name: str) -> "genai.GenerativeModel":
+    """Return the shared GenerativeModel for name, configuring the SDK on first use."""
+    configure_gemini()
+    return genai.GenerativeModel(name)
+
+def create_context_cache(contents: List[str], system_instruction: Optional[str] = None,
+                         ttl_seconds: Optional[int] = None):
+    """Upload contents as a Gemini context cache, or return None if too small or the call fails."""
+    # Gemini rejects caches below a minimum size; ~4 chars per token is close enough to skip the call
+    if sum(len(content) for content in contents) // 4 < config.CONTEXT_CACHE_MIN_TOKENS:
+        return None
+    try:
+        return genai.caching.CachedContent.create(
+            model=config.MODEL_NAME,
+            system_instruction=system_instruction,
+            contents=contents,
+            ttl=timedelta(seconds=ttl_seconds or config.CONTEXT_CACHE_TTL_SECONDS)
+        )
+    except Exception:
+        return None
@@ -4,21 +4,90 @@ Main Streamlit Application
 """
 
 import streamlit as st
+import hashlib
 import os
 from dotenv import load_dotenv
+from jinja2 import Environment
 
 # Load environment variables
 load_dotenv()
 
-# Import PitchOS components
-from src.pitch_analyzer import PitchAnalyzer
+# Import PitchOS components; the analyzer (Gemini SDK, models) is imported lazily in get_analyzer
 from src.ui_components import PitchOSUI
-from src.file_processor import FileProcessor
 from src.config import config
 
+@st.cache_resource
+def get_analyzer():
+    """Build the pitch analyzer once per server process and reuse it across reruns."""
+    from src.pitch_analyzer import PitchAnalyzer
+    return PitchAnalyzer()
+
+# Markdown report, compiled once at import
+_REPORT_TEMPLATE = Environment(trim_blocks=True, lstrip_blocks=True, keep_trailing_newline=True).from_string("""\
+# PitchOS Analysis Report
+
+## Pitch Summary
+{{ pitch }}...
+
+## Overall Scores
+- **Readiness Score:** {{ "%.1f"|format(result.readiness_score) }}/100
+- **Storytelling Score:** {{ "%.1f"|format(result.storytelling_score) }}/10
+- **Emotional Hook Score:** {{ "%.1f"|format(result.emotional_hook_score) }}/10
+- **Hype Meter:** {{ "%.1f"|format(result.hype_meter) }}/100
+
+## Startup Archetype
+**{{ result.startup_archetype }}**
+
+## Investor Reactions
+{% for reaction in result.investor_simulations %}
+
+### {{ reaction.persona }} ({{ reaction.investment_likelihood.value }})
+{{ reaction.reaction }}
+
+**Key Concerns:**
+{% for concern in reaction.key_concerns %}
+- {{ concern }}
+{% endfor %}
+{% endfor %}
+
+## Key Issues Detected
+{% for flag in result.pitch_flags %}
+- {{ flag }}
+{% endfor %}
+
+## Recommendations
+{% for rec in result.recommendations.get("next_steps", []) %}
+- {{ rec }}
+{% endfor %}
+
+## Team-Product-Market Fit
+- Team: {{ "%.1f"|format(result.team_product_market_fit.team_score) }}/10
+- Product: {{ "%.1f"|format(result.team_product_market_fit.product_score) }}/10
+- Market: {{ "%.1f"|format(result.team_product_market_fit.market_score) }}/10
+- Alignment: {{ "%.1f"|format(result.team_product_market_fit.alignment_score) }}/10
+
+{{ result.team_product_market_fit.rationale }}
+
+---
+*Generated by PitchOS - AI Pitch Deck Analyzer*
+""")
+
+@st.cache_data(ttl=3600, show_spinner=False)
+def _cached_analyze(pitch_hash: str, _pitch_content: str, mode: str, source_type: str,
+                    semantic_cache: bool = False):
+    """Analyze a pitch, reusing the result for an identical pitch, mode and source type.
+    
+    The content is keyed by pitch_hash; the leading underscore keeps Streamlit from hashing it again.
+    """
+    return get_analyzer().analyze_pitch(_pitch_content, mode, source_type, semantic_cache)
+
 def main():
     """Main application entry point."""
     
+    # Session keys exist from the first run, so later checks are plain lookups
+    for key in ('analysis_result', 'pitch_content', 'analysis_mode', 'ocr_results'):
+        st.session_state.setdefault(key, None)
+    
     # Initialize UI
     ui = PitchOSUI()
     ui.render_header()
@@ -71,21 +140,26 @@ def main():
         
         st.stop()
     
+    # Near-duplicate reuse is opt-in so edited pitches are rescored
+    semantic_cache = st.checkbox(
+        "Reuse the analysis of a very similar earlier pitch",
+        value=False,
+        help="Faster for reworded resubmissions, but small edits (e.g. new traction numbers) won't be rescored"
+    )
+    
     # Analyze button
     if st.button("🚀 Analyze My Pitch", type="primary", use_container_width=True):
         
         with st.spinner("🧠 Analyzing your pitch with AI..."):
             try:
-                # Initialize analyzer
-                analyzer = PitchAnalyzer()
-                
                 # Determine source type
                 source_type = "text"
                 if "--- Slide" in pitch_content:  # OCR content contains slide markers
                     source_type = "ocr"
 
-                # Perform analysis
-                result = analyzer.analyze_pitch(pitch_content, mode, source_type)
+                # Perform analysis (served from cache if this exact pitch was already analyzed)
+                pitch_hash = hashlib.blake2b(pitch_content.encode(), digest_size=16).hexdigest()
+                result = _cached_analyze(pitch_hash, pitch_content, mode, source_type, semantic_cache)
                 
                 # Store result in session state
                 st.session_state.analysis_result = result
@@ -100,11 +174,11 @@ def main():
                 return
     
     # Display results if available
-    if hasattr(st.session_state, 'analysis_result'):
+    if st.session_state.analysis_result is not None:
         result = st.session_state.analysis_result
 
         # Show OCR processing info if applicable
-        if hasattr(st.session_state, 'ocr_results'):
+        if st.session_state.ocr_results is not None:
             ui.render_ocr_quality_summary(st.session_state.ocr_results)
             st.markdown("---")
 
@@ -161,60 +235,7 @@ def main():
 
 def generate_report(result, pitch_content: str) -> str:
     """Generate a downloadable analysis report."""
-    
-    report = f"""# PitchOS Analysis Report
-
-## Pitch Summary
-{pitch_content[:500]}...
-
-## Overall Scores
-- **Readiness Score:** {result.readiness_score:.1f}/100
-- **Storytelling Score:** {result.storytelling_score:.1f}/10
-- **Emotional Hook Score:** {result.emotional_hook_score:.1f}/10
-- **Hype Meter:** {result.hype_meter:.1f}/100
-
-## Startup Archetype
-**{result.startup_archetype}**
-
-## Investor Reactions
-"""
-    
-    for reaction in result.investor_simulations:
-        report += f"""
-### {reaction.persona} ({reaction.investment_likelihood.value})
-{reaction.reaction}
-
-**Key Concerns:**
-"""
-        for concern in reaction.key_concerns:
-            report += f"- {concern}\n"
-    
-    report += f"""
-## Key Issues Detected
-"""
-    for flag in result.pitch_flags:
-        report += f"- {flag}\n"
-    
-    report += f"""
-## Recommendations
-"""
-    for rec in result.recommendations.get("next_steps", []):
-        report += f"- {rec}\n"
-    
-    report += f"""
-## Team-Product-Market Fit
-- Team: {result.team_product_market_fit.team_score:.1f}/10
-- Product: {result.team_product_market_fit.product_score:.1f}/10
-- Market: {result.team_product_market_fit.market_score:.1f}/10
-- Alignment: {result.team_product_market_fit.alignment_score:.1f}/10
-
-{result.team_product_market_fit.rationale}
-
----
-*Generated by PitchOS - AI Pitch Deck Analyzer*
-"""
-    
-    return report
+    return _REPORT_TEMPLATE.render(result=result, pitch=pitch_content[:500])
 
 if __name__ == "__main__":
     main()
@@ -10,9 +10,21 @@ from dotenv import load_dotenv
 # Load environment variables
 load_dotenv()
 
+@st.cache_resource
+def get_analyzer():
+    """Build the pitch analyzer once per server process and reuse it across reruns."""
+    # Import here to avoid dependency issues on startup
+    import sys
+    sys.path.append('src')
+    
+    from src.pitch_analyzer import PitchAnalyzer
+    return PitchAnalyzer()
+
 def main():
     """Minimal PitchOS application."""
     
+    st.session_state.setdefault('analysis_result', None)
+    
     # Page config
     st.set_page_config(
         page_title="PitchOS - AI Pitch Deck Analyzer",
@@ -81,14 +93,8 @@ def main():
         
         with st.spinner("🧠 Analyzing your pitch..."):
             try:
-                # Import here to avoid dependency issues on startup
-                import sys
-                sys.path.append('src')
-                
-                from src.pitch_analyzer import PitchAnalyzer
-                
                 # Analyze pitch
-                analyzer = PitchAnalyzer()
+                analyzer = get_analyzer()
                 result = analyzer.analyze_pitch(pitch_content, mode.lower())
                 
                 # Store in session state
@@ -104,7 +110,7 @@ def main():
                 return
     
     # Display results
-    if hasattr(st.session_state, 'analysis_result'):
+    if st.session_state.analysis_result is not None:
         result = st.session_state.analysis_result
         
         # Readiness Score
@@ -0,0 +1,20 @@
+"""
+Gunicorn settings for production: gunicorn -c gunicorn.conf.py main:app
+"""
+
+import gc
+import multiprocessing
+import os
+
+# Load main.py (and the OCR model it preloads) once in the master before forking
+os.environ["PITCHOS_PRELOAD"] = "1"
+preload_app = True
+
+bind = os.getenv("BIND", "0.0.0.0:8000")
+worker_class = "uvicorn.workers.UvicornWorker"
+workers = int(os.getenv("UVICORN_WORKERS", multiprocessing.cpu_count() * 2 + 1))
+loglevel = os.getenv("LOG_LEVEL", "warning").lower()
+
+def pre_fork(server, worker):
+    """Move preloaded objects out of GC tracking so collections don't dirty shared pages."""
+    gc.freeze()
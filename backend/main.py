@@ -1,17 +1,42 @@
 """
 FastAPI Backend for PitchOS React Frontend
+
+PITCHOS_MODE=full (default) serves real analysis; PITCHOS_MODE=simple serves
+mock responses without loading the analyzer, OCR or document dependencies.
 """
 
-from fastapi import FastAPI, HTTPException, UploadFile, File, Form
+from fastapi import APIRouter, FastAPI, HTTPException, Request, UploadFile, File, Form
+from fastapi.exceptions import RequestValidationError
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
-from pydantic import BaseModel
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import JSONResponse, Response
+from pydantic import BaseModel, ValidationError
 from typing import List, Optional
 import os
 import sys
 import asyncio
-from io import BytesIO
-from PIL import Image
+import hashlib
+import json
+import logging
+import time
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import asynccontextmanager
+from collections import OrderedDict
+
+# orjson serializes responses in one C pass; fall back to the stdlib encoder without it
+try:
+    import orjson
+    from fastapi.responses import ORJSONResponse as APIResponse
+except ImportError:
+    orjson = None
+    APIResponse = JSONResponse
+
+# Brotli compresses analysis JSON tighter than gzip and falls back to gzip for older clients
+try:
+    from brotli_asgi import BrotliMiddleware
+except ImportError:
+    BrotliMiddleware = None
 
 # Add src directory to path for PitchOS imports
 current_dir = os.path.dirname(os.path.abspath(__file__))
@@ -20,30 +45,141 @@ src_dir = os.path.join(parent_dir, 'src')
 sys.path.insert(0, parent_dir)  # Add parent directory to Python path
 sys.path.insert(0, src_dir)     # Add src directory to Python path
 
-print(f"Current directory: {current_dir}")
-print(f"Parent directory: {parent_dir}")
-print(f"Src directory: {src_dir}")
-print(f"Src directory exists: {os.path.exists(src_dir)}")
+# WARNING by default keeps stdout writes off the request path; LOG_LEVEL=DEBUG for diagnostics
+logging.basicConfig(level=os.getenv("LOG_LEVEL", "WARNING").upper())
+logger = logging.getLogger("pitchos")
+
+if logger.isEnabledFor(logging.DEBUG):
+    logger.debug("Backend dir %s, src dir %s (exists: %s)", current_dir, src_dir, os.path.exists(src_dir))
 
 from dotenv import load_dotenv
 load_dotenv()
 
+PITCHOS_MODE = os.getenv("PITCHOS_MODE", "full")
+
+# Heavy imports are only paid for by the full app
+if PITCHOS_MODE == "full":
+    from PIL import Image
+    from src.config import config
+    from src.models import dump_analysis_result
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Build the shared analyzer and processors before the first request; release them on shutdown."""
+    # Size the threadpool used by run_in_threadpool and sync endpoints
+    from anyio.to_thread import current_default_thread_limiter
+    current_default_thread_limiter().total_tokens = THREAD_POOL_SIZE
+    
+    app.state.analyzer_pool = None
+    if PITCHOS_MODE == "full":
+        # Start the analyzer process pool when ANALYZER_PROCESSES is set
+        if ANALYZER_PROCESSES > 0:
+            app.state.analyzer_pool = ProcessPoolExecutor(
+                max_workers=ANALYZER_PROCESSES, initializer=_init_analyzer_worker
+            )
+        
+        # Model loads run off the event loop; a failure leaves the slot empty and is retried on first use
+        app.state.analyzer = None
+        if app.state.analyzer_pool is None:
+            app.state.analyzer = await run_in_threadpool(_preload, "analyzer", _create_analyzer)
+        app.state.ocr_processor = _PRELOADED.get("ocr_processor")
+        if app.state.ocr_processor is not None:
+            app.state.ocr_processor.start_warm_up()  # Deferred from the master until after fork
+        else:
+            app.state.ocr_processor = await run_in_threadpool(_preload, "OCR processor", _create_ocr_processor)
+        app.state.file_processor = _PRELOADED.get("file_processor") or await run_in_threadpool(
+            _preload, "file processor", _create_file_processor
+        )
+    
+    # Features can't change without a restart, so the health body is built once
+    if PITCHOS_MODE == "full":
+        app.state.features = await run_in_threadpool(_detect_features)
+    else:
+        app.state.features = SIMPLE_FEATURES
+    app.state.health_body = APIResponse(
+        {"status": "healthy", "version": "1.0.0", "features": app.state.features}
+    ).body
+    
+    yield
+    
+    if app.state.analyzer_pool is not None:
+        app.state.analyzer_pool.shutdown(cancel_futures=True)
+
 # FastAPI app
 app = FastAPI(
     title="PitchOS API",
     description="AI-Powered Startup Pitch Deck Analyzer API",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=APIResponse,
+    lifespan=lifespan
 )
 
-# CORS middleware
+# Compress analysis payloads; health pings under minimum_size are sent as-is.
+# Registered before CORS so CORS wraps it and its headers land on the final response
+if BrotliMiddleware is not None:
+    app.add_middleware(BrotliMiddleware, quality=4, minimum_size=1024)
+else:
+    app.add_middleware(GZipMiddleware, minimum_size=1024, compresslevel=5)
+
+# CORS middleware; explicit methods/headers give a fixed preflight response that
+# browsers cache for max_age seconds instead of re-sending OPTIONS per request
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["http://localhost:3000", "http://127.0.0.1:3000"],
     allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
+    allow_methods=["GET", "POST"],
+    allow_headers=["content-type", "authorization"],
+    max_age=86400,
 )
 
+# Worker threads for blocking work (OCR, file parsing); anyio's default of 40 is shared by all sync endpoints
+THREAD_POOL_SIZE = int(os.getenv("THREAD_POOL_SIZE", 64))
+
+# Serialized /api/analyze responses by request hash: (JSON body, expiry time)
+ANALYSIS_CACHE_SIZE = int(os.getenv("ANALYSIS_CACHE_SIZE", 512))
+ANALYSIS_CACHE_TTL_SECONDS = int(os.getenv("ANALYSIS_CACHE_TTL_SECONDS", 3600))
+_analysis_cache: "OrderedDict[str, tuple]" = OrderedDict()
+
+def _analysis_cache_key(content: str, mode: str, source_type: str, cache: str) -> str:
+    """Hash an analyze request; identical resubmissions share a key."""
+    return hashlib.blake2b(f"{mode}|{source_type}|{cache}|{content}".encode(), digest_size=16).hexdigest()
+
+def _get_cached_analysis(key: str) -> Optional[bytes]:
+    """Return the cached response body for key, or None if missing or expired."""
+    entry = _analysis_cache.get(key)
+    if entry is None:
+        return None
+    body, expires = entry
+    if expires <= time.monotonic():
+        del _analysis_cache[key]
+        return None
+    _analysis_cache.move_to_end(key)
+    return body
+
+def _store_analysis(key: str, body: bytes) -> None:
+    """Remember a response body, evicting the least recently used entries."""
+    _analysis_cache[key] = (body, time.monotonic() + ANALYSIS_CACHE_TTL_SECONDS)
+    _analysis_cache.move_to_end(key)
+    while len(_analysis_cache) > ANALYSIS_CACHE_SIZE:
+        _analysis_cache.popitem(last=False)
+
+# Analyzer processes for CPU-heavy deployments; 0 keeps analysis on the event loop
+ANALYZER_PROCESSES = int(os.getenv("ANALYZER_PROCESSES", 0))
+_worker_analyzer = None
+
+def _init_analyzer_worker():
+    """Build one analyzer per pool process, so it is never pickled per call."""
+    global _worker_analyzer
+    from src.pitch_analyzer import PitchAnalyzer
+    _worker_analyzer = PitchAnalyzer()
+
+def _analyze_in_worker(content: str, mode: str, source_type: str, semantic_cache: bool) -> bytes:
+    """Analyze in a pool process and return the serialized response body."""
+    result = _worker_analyzer.analyze_pitch(content, mode, source_type, semantic_cache)
+    payload = {"success": True, "data": dump_analysis_result(result, mode="json"), "error": None}
+    # Bytes cross the process boundary much more cheaply than the nested model
+    return orjson.dumps(payload) if orjson is not None else json.dumps(payload).encode()
+
 # Pydantic models
 class PitchAnalysisRequest(BaseModel):
     content: str
@@ -60,29 +196,120 @@ class HealthResponse(BaseModel):
     version: str
     features: dict
 
-# Global analyzer instance
-analyzer = None
+def _create_analyzer():
+    """Create the pitch analyzer."""
+    from src.pitch_analyzer import PitchAnalyzer
+    return PitchAnalyzer()
+
+def _create_ocr_processor():
+    """Create the OCR processor, loading the EasyOCR model."""
+    from src.ocr_processor import HybridOCRProcessor
+    return HybridOCRProcessor()
+
+def _create_file_processor():
+    """Create the document text extractor."""
+    from src.file_processor import FileProcessor
+    return FileProcessor()
+
+def _preload(name: str, factory):
+    """Build a shared instance at startup, or return None so it is retried on first use."""
+    try:
+        instance = factory()
+        logger.info("%s created", name)
+        return instance
+    except Exception as e:
+        logger.warning("Failed to create %s: %s", name, e)
+        return None
 
 def get_analyzer():
-    """Get or create analyzer instance."""
-    global analyzer
-    if analyzer is None:
+    """Get the shared analyzer instance, creating it if startup couldn't."""
+    if app.state.analyzer is None:
         try:
-            import src.pitch_analyzer
-            from src.pitch_analyzer import PitchAnalyzer
-            print("Attempting to create PitchAnalyzer instance...")
-            analyzer = PitchAnalyzer()
-            print("PitchAnalyzer created successfully!")
+            app.state.analyzer = _create_analyzer()
         except Exception as e:
-            print(f"Failed to create analyzer: {str(e)}")
+            logger.error("Failed to create analyzer: %s", e)
             raise HTTPException(status_code=500, detail=f"Failed to initialize analyzer: {str(e)}")
-    return analyzer
+    return app.state.analyzer
+
+def get_ocr_processor():
+    """Get the shared OCR processor, so the EasyOCR model isn't reloaded per request."""
+    if app.state.ocr_processor is None:
+        app.state.ocr_processor = _create_ocr_processor()
+    return app.state.ocr_processor
+
+def get_file_processor():
+    """Get the shared file processor."""
+    if app.state.file_processor is None:
+        app.state.file_processor = _create_file_processor()
+    return app.state.file_processor
+
+# Cleaned text and validity of extracted documents by content digest, for retried uploads.
+# Keyed by digest so the cache never holds full raw documents
+_validated_content: "OrderedDict[bytes, tuple]" = OrderedDict()
+VALIDATED_CONTENT_CACHE_SIZE = 256
+
+def _clean_and_validate(processor, content: str) -> tuple:
+    """Return (cleaned content, is valid pitch), reusing the result for identical text."""
+    key = hashlib.blake2b(content.encode(), digest_size=16).digest()
+    entry = _validated_content.get(key)
+    if entry is not None:
+        _validated_content.move_to_end(key)
+        return entry
+    
+    cleaned = processor.clean_content(content)
+    entry = (cleaned, processor.validate_content(cleaned))
+    _validated_content[key] = entry
+    while len(_validated_content) > VALIDATED_CONTENT_CACHE_SIZE:
+        _validated_content.popitem(last=False)
+    return entry
+
+def _create_fork_safe_ocr_processor():
+    """Create an OCR processor whose master-side state survives fork: CPU weights, no inference yet."""
+    from src.ocr_processor import HybridOCRProcessor
+    # CUDA can't be used again in a forked child, and a warm-up inference would start
+    # torch's OpenMP and OpenCV's thread pools, which forked workers can deadlock on
+    return HybridOCRProcessor(gpu=False, warm_up=False)
+
+# Under gunicorn --preload (see gunicorn.conf.py) the OCR weights are loaded once in the
+# master, and forked workers share them copy-on-write; each worker warms up in its lifespan.
+# GPU deployments (OCR_USE_GPU=true) load per worker instead, since CUDA state can't be forked.
+# The analyzer is always built per worker: its gRPC channel, SQLite cache and event-loop
+# thread don't survive fork
+_PRELOADED = {}
+if PITCHOS_MODE == "full" and os.getenv("PITCHOS_PRELOAD") == "1":
+    if config.OCR_USE_GPU is not True:
+        _PRELOADED["ocr_processor"] = _preload("OCR processor", _create_fork_safe_ocr_processor)
+    _PRELOADED["file_processor"] = _preload("file processor", _create_file_processor)
+
+def _ocr_image(processor, image_file, filename: str) -> dict:
+    """Decode and OCR one uploaded image (blocking; run on a worker thread)."""
+    # Decode straight from the spooled upload; for JPEGs, draft() lets libjpeg
+    # downscale during decoding so oversized slides never exist at full size
+    image = Image.open(image_file)
+    image.draft("RGB", (config.IMAGE_MAX_WIDTH, config.IMAGE_MAX_HEIGHT))
+    # Other formats (and the remainder of a draft) are shrunk here, so preprocessing
+    # and the EasyOCR detector never see more pixels than the preprocessor would keep;
+    # slide text stays legible at 1080p
+    image.thumbnail((config.IMAGE_MAX_WIDTH, config.IMAGE_MAX_HEIGHT), Image.Resampling.LANCZOS)
+    ocr_result = processor.process_image(image, filename)
+    
+    return {
+        "filename": filename,
+        "text": ocr_result.text,
+        "method": ocr_result.method,
+        "confidence": ocr_result.confidence,
+        "is_valid": ocr_result.is_valid,
+        "issues": ocr_result.issues,
+        "processing_time": ocr_result.processing_time
+    }
 
 @app.get("/", response_model=HealthResponse)
 async def root():
-    """Health check endpoint."""
+    """Health check endpoint; the body is serialized once at startup."""
+    return Response(app.state.health_body, media_type="application/json")
 
-    # Check available features
+def _detect_features() -> dict:
+    """Probe optional OCR and analyzer imports."""
     features = {
         "core_analysis": True,
         "file_upload": True,
@@ -106,13 +333,12 @@ async def root():
     except Exception as e:
         features["analyzer_error"] = str(e)
 
-    return HealthResponse(
-        status="healthy",
-        version="1.0.0",
-        features=features
-    )
+    return features
+
+# Routes registered only in full mode
+full_api = APIRouter()
 
-@app.get("/api/test")
+@full_api.get("/api/test")
 async def test_analyzer():
     """Test analyzer initialization."""
     try:
@@ -122,149 +348,95 @@ async def test_analyzer():
     except Exception as e:
         return {"success": False, "error": str(e)}
 
-@app.post("/api/analyze", response_model=PitchAnalysisResponse)
-async def analyze_pitch(request: PitchAnalysisRequest):
-    """Analyze pitch content."""
+# Analyses in progress by request hash
+_inflight_analyses: dict = {}
+
+async def _run_analysis(request: PitchAnalysisRequest, semantic_cache: bool) -> bytes:
+    """Analyze a pitch in the process pool or on the event loop; returns the response body."""
+    if app.state.analyzer_pool is not None:
+        return await asyncio.get_running_loop().run_in_executor(
+            app.state.analyzer_pool, _analyze_in_worker,
+            request.content, request.mode, request.source_type, semantic_cache
+        )
+    
+    # Perform analysis
+    result = await get_analyzer().analyze_pitch_async(
+        request.content,
+        request.mode,
+        request.source_type,
+        semantic_cache=semantic_cache
+    )
+    
+    # Serialize with the shared TypeAdapter (enums become their values); returned as bytes
+    # so FastAPI doesn't re-encode and re-validate the payload
+    result_dict = dump_analysis_result(result, mode="json")
+    return APIResponse({"success": True, "data": result_dict, "error": None}).body
+
+# The body is validated by the handler, so its schema is declared here for the docs
+_ANALYZE_REQUEST_BODY = {
+    "requestBody": {
+        "required": True,
+        "content": {"application/json": {"schema": PitchAnalysisRequest.model_json_schema()}}
+    }
+}
+
+@full_api.post("/api/analyze", response_model=PitchAnalysisResponse, openapi_extra=_ANALYZE_REQUEST_BODY)
+async def analyze_pitch(http_request: Request, cache: str = "exact"):
+    """Analyze pitch content.
+    
+    cache=exact (default) only reuses analyses of the same pitch, so edited resubmissions
+    are rescored; cache=semantic also reuses the analysis of a near-duplicate earlier pitch.
+    """
+    # Parse and validate the raw body in one pass instead of json.loads + model_validate
+    try:
+        request = PitchAnalysisRequest.model_validate_json(await http_request.body())
+    except ValidationError as e:
+        raise RequestValidationError(e.errors(include_url=False))
 
     try:
         if not request.content.strip():
             raise HTTPException(status_code=400, detail="Pitch content cannot be empty")
 
-        # Get analyzer
-        pitch_analyzer = get_analyzer()
+        # Resubmissions are answered with the bytes already sent, skipping analysis and serialization
+        cache_key = _analysis_cache_key(request.content, request.mode, request.source_type, cache)
+        cached_body = _get_cached_analysis(cache_key)
+        if cached_body is not None:
+            return Response(content=cached_body, media_type="application/json")
 
-        # Perform analysis
-        result = pitch_analyzer.analyze_pitch(
-            request.content,
-            request.mode,
-            request.source_type
-        )
+        # Concurrent identical requests share one in-flight analysis
+        task = _inflight_analyses.get(cache_key)
+        if task is None:
+            task = asyncio.ensure_future(_run_analysis(request, cache == "semantic"))
+            _inflight_analyses[cache_key] = task
+            task.add_done_callback(lambda _: _inflight_analyses.pop(cache_key, None))
         
-        # Convert result to dict
-        result_dict = {
-            "deck_summary": {
-                "problem": {
-                    "content": result.deck_summary.problem.content,
-                    "clarity_score": result.deck_summary.problem.clarity_score,
-                    "completeness_score": result.deck_summary.problem.completeness_score
-                },
-                "solution": {
-                    "content": result.deck_summary.solution.content,
-                    "clarity_score": result.deck_summary.solution.clarity_score,
-                    "completeness_score": result.deck_summary.solution.completeness_score
-                },
-                "market": {
-                    "content": result.deck_summary.market.content,
-                    "clarity_score": result.deck_summary.market.clarity_score,
-                    "completeness_score": result.deck_summary.market.completeness_score
-                },
-                "traction": {
-                    "content": result.deck_summary.traction.content,
-                    "clarity_score": result.deck_summary.traction.clarity_score,
-                    "completeness_score": result.deck_summary.traction.completeness_score
-                },
-                "business_model": {
-                    "content": result.deck_summary.business_model.content,
-                    "clarity_score": result.deck_summary.business_model.clarity_score,
-                    "completeness_score": result.deck_summary.business_model.completeness_score
-                },
-                "team": {
-                    "content": result.deck_summary.team.content,
-                    "clarity_score": result.deck_summary.team.clarity_score,
-                    "completeness_score": result.deck_summary.team.completeness_score
-                },
-                "financials": {
-                    "content": result.deck_summary.financials.content,
-                    "clarity_score": result.deck_summary.financials.clarity_score,
-                    "completeness_score": result.deck_summary.financials.completeness_score
-                },
-                "competition": {
-                    "content": result.deck_summary.competition.content,
-                    "clarity_score": result.deck_summary.competition.clarity_score,
-                    "completeness_score": result.deck_summary.competition.completeness_score
-                },
-                "vision": {
-                    "content": result.deck_summary.vision.content,
-                    "clarity_score": result.deck_summary.vision.clarity_score,
-                    "completeness_score": result.deck_summary.vision.completeness_score
-                }
-            },
-            "readiness_score": result.readiness_score,
-            "hype_meter": result.hype_meter,
-            "startup_archetype": result.startup_archetype,
-            "storytelling_score": result.storytelling_score,
-            "emotional_hook_score": result.emotional_hook_score,
-            "investor_simulations": [
-                {
-                    "persona": reaction.persona,
-                    "avatar": reaction.avatar,
-                    "reaction": reaction.reaction,
-                    "investment_likelihood": reaction.investment_likelihood.value,
-                    "key_concerns": reaction.key_concerns,
-                    "excitement_level": reaction.excitement_level
-                }
-                for reaction in result.investor_simulations
-            ],
-            "vc_qa_battle": {
-                "questions": [
-                    {
-                        "question": qa.question,
-                        "ideal_response": qa.ideal_response,
-                        "difficulty_level": qa.difficulty_level,
-                        "category": qa.category
-                    }
-                    for qa in result.vc_qa_battle.questions
-                ]
-            },
-            "pitch_flags": result.pitch_flags,
-            "crowd_feedback": [
-                {
-                    "comment": feedback.comment,
-                    "sentiment": feedback.sentiment,
-                    "emoji": feedback.emoji,
-                    "category": feedback.category
-                }
-                for feedback in result.crowd_feedback
-            ],
-            "idea_validation_report": {
-                "logic_pass": result.idea_validation_report.logic_pass,
-                "issues_detected": result.idea_validation_report.issues_detected,
-                "confidence_score": result.idea_validation_report.confidence_score,
-                "market_validation_score": result.idea_validation_report.market_validation_score,
-                "technical_feasibility_score": result.idea_validation_report.technical_feasibility_score
-            },
-            "team_product_market_fit": {
-                "team_score": result.team_product_market_fit.team_score,
-                "product_score": result.team_product_market_fit.product_score,
-                "market_score": result.team_product_market_fit.market_score,
-                "alignment_score": result.team_product_market_fit.alignment_score,
-                "rationale": result.team_product_market_fit.rationale
-            },
-            "recommendations": result.recommendations
-        }
-        
-        return PitchAnalysisResponse(success=True, data=result_dict)
+        # Shielded so one client disconnecting doesn't cancel the others' analysis
+        body = await asyncio.shield(task)
+        _store_analysis(cache_key, body)
+        return Response(content=body, media_type="application/json")
         
     except Exception as e:
-        return PitchAnalysisResponse(success=False, error=str(e))
+        return APIResponse({"success": False, "data": None, "error": str(e)})
 
-@app.post("/api/upload-file")
+@full_api.post("/api/upload-file")
 async def upload_file(file: UploadFile = File(...)):
     """Upload and process file (PDF, DOC, TXT)."""
     
     try:
-        from src.file_processor import FileProcessor
+        processor = await run_in_threadpool(get_file_processor)
         
-        processor = FileProcessor()
-        content = processor.process_uploaded_file(file)
+        # Starlette uploads have an async read() and content_type rather than Streamlit's
+        # read()/type, so pass the bytes; parsing runs off the event loop
+        data = await file.read()
+        content = await run_in_threadpool(processor.extract_text, data, file.content_type)
         
         if not content:
             raise HTTPException(status_code=400, detail="Could not extract text from file")
         
         # Clean and validate
-        content = processor.clean_content(content)
+        content, is_valid = _clean_and_validate(processor, content)
         
-        if not processor.validate_content(content):
+        if not is_valid:
             raise HTTPException(status_code=400, detail="File content doesn't appear to be a pitch deck")
         
         return {"success": True, "content": content, "filename": file.filename}
@@ -272,33 +444,17 @@ async def upload_file(file: UploadFile = File(...)):
     except Exception as e:
         return {"success": False, "error": str(e)}
 
-@app.post("/api/upload-images")
+@full_api.post("/api/upload-images")
 async def upload_images(files: List[UploadFile] = File(...)):
     """Upload and process images with OCR."""
     
     try:
-        from src.ocr_processor import HybridOCRProcessor
-        
-        processor = HybridOCRProcessor()
-        results = []
+        processor = await run_in_threadpool(get_ocr_processor)
         
-        for file in files:
-            # Load image
-            image_data = await file.read()
-            image = Image.open(BytesIO(image_data))
-            
-            # Process with OCR
-            ocr_result = processor.process_image(image, file.filename)
-            
-            results.append({
-                "filename": file.filename,
-                "text": ocr_result.text,
-                "method": ocr_result.method,
-                "confidence": ocr_result.confidence,
-                "is_valid": ocr_result.is_valid,
-                "issues": ocr_result.issues,
-                "processing_time": ocr_result.processing_time
-            })
+        # Images are independent; OCR runs on worker threads and results keep upload order
+        results = await asyncio.gather(*(
+            run_in_threadpool(_ocr_image, processor, file.file, file.filename) for file in files
+        ))
         
         # Combine all text
         combined_text = []
@@ -317,6 +473,110 @@ async def upload_images(files: List[UploadFile] = File(...)):
     except Exception as e:
         return {"success": False, "error": str(e)}
 
+# Mock responses for PITCHOS_MODE=simple
+SIMPLE_FEATURES = {
+    "core_analysis": True,
+    "file_upload": True,
+    "ocr_processing": False,
+    "simple_mode": True
+}
+
+_MOCK_ANALYSIS = {
+    "summary": {
+        "title": "Pitch Analysis Complete",
+        "overall_score": 7.5,
+        "key_strengths": [
+            "Clear problem statement",
+            "Strong market opportunity",
+            "Experienced team"
+        ],
+        "areas_for_improvement": [
+            "Financial projections need more detail",
+            "Competitive analysis could be stronger",
+            "Go-to-market strategy needs refinement"
+        ]
+    },
+    "detailed_feedback": {
+        "problem_solution_fit": {
+            "score": 8.0,
+            "feedback": "The problem is well-defined and the solution addresses a real market need."
+        },
+        "market_opportunity": {
+            "score": 7.5,
+            "feedback": "Large addressable market with clear growth potential."
+        },
+        "business_model": {
+            "score": 7.0,
+            "feedback": "Revenue model is clear but could benefit from more detailed unit economics."
+        },
+        "team": {
+            "score": 8.5,
+            "feedback": "Strong founding team with relevant experience and complementary skills."
+        },
+        "financials": {
+            "score": 6.5,
+            "feedback": "Financial projections are present but need more supporting assumptions."
+        }
+    },
+    "investor_perspective": {
+        "investment_likelihood": "Medium-High",
+        "key_concerns": [
+            "Market competition",
+            "Scalability questions",
+            "Customer acquisition costs"
+        ],
+        "next_steps": [
+            "Provide detailed financial model",
+            "Show customer validation",
+            "Demonstrate early traction"
+        ]
+    }
+}
+
+# The mock payload never changes, so it is serialized once
+_MOCK_ANALYSIS_BODY = APIResponse({"success": True, "analysis": _MOCK_ANALYSIS, "error": None}).body
+
+simple_api = APIRouter()
+
+@simple_api.post("/api/analyze")
+async def analyze_pitch_mock(request: PitchAnalysisRequest):
+    """Analyze pitch content - Simple mock version."""
+    if not request.content.strip():
+        raise HTTPException(status_code=400, detail="Pitch content cannot be empty")
+    return Response(content=_MOCK_ANALYSIS_BODY, media_type="application/json")
+
+@simple_api.post("/api/upload")
+async def upload_file_mock(file: UploadFile = File(...)):
+    """Handle file upload without processing it."""
+    if not file.filename:
+        raise HTTPException(status_code=400, detail="No file provided")
+    return {
+        "success": True,
+        "filename": file.filename,
+        "message": "File uploaded successfully (mock)"
+    }
+
+app.include_router(full_api if PITCHOS_MODE == "full" else simple_api)
+
+# Build the OpenAPI schema now; FastAPI caches it on app.openapi_schema for /openapi.json and /docs
+app.openapi()
+
 if __name__ == "__main__":
+    import importlib.util
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8000)
+    
+    # Force the C event loop and HTTP parser where installed (uvloop has no Windows build)
+    has_uvloop = importlib.util.find_spec("uvloop") is not None
+    has_httptools = importlib.util.find_spec("httptools") is not None
+    
+    # Multiple workers need an import string; each worker loads its own analyzer and OCR model
+    uvicorn.run(
+        "main:app",
+        app_dir=current_dir,
+        host="0.0.0.0",
+        port=8000,
+        loop="uvloop" if has_uvloop else "asyncio",
+        http="httptools" if has_httptools else "h11",
+        workers=int(os.getenv("UVICORN_WORKERS", (os.cpu_count() or 1) * 2 + 1)),
+        log_level=os.getenv("UVICORN_LOG_LEVEL", "warning")
+    )
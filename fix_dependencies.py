@@ -6,11 +6,15 @@ import subprocess
 import sys
 import os
 
+def pip_command(*args):
+    """Build a pip invocation for the running interpreter."""
+    return [sys.executable, "-m", "pip", *args]
+
 def run_command(command):
-    """Run a command and return success status."""
+    """Run a command (argument list, no shell) and return success status."""
     try:
-        result = subprocess.run(command, shell=True, capture_output=True, text=True)
-        print(f"Command: {command}")
+        result = subprocess.run(command, capture_output=True, text=True)
+        print(f"Command: {' '.join(command)}")
         if result.returncode == 0:
             print("✅ Success")
             if result.stdout:
@@ -31,42 +35,28 @@ def fix_numpy_pandas_compatibility():
     # Step 1: Uninstall problematic packages
     print("Step 1: Uninstalling potentially conflicting packages...")
     packages_to_uninstall = ["numpy", "pandas", "streamlit"]
-    
-    for package in packages_to_uninstall:
-        run_command(f"pip uninstall {package} -y")
+    run_command(pip_command("uninstall", "-y", *packages_to_uninstall))
     
     print("\n" + "="*50)
     
     # Step 2: Clear pip cache
     print("Step 2: Clearing pip cache...")
-    run_command("pip cache purge")
-    
-    print("\n" + "="*50)
-    
-    # Step 3: Install compatible versions
-    print("Step 3: Installing compatible versions...")
-    
-    # Install numpy first (specific compatible version)
-    print("Installing numpy...")
-    run_command("pip install numpy==1.24.3")
-    
-    # Install pandas with compatible numpy
-    print("Installing pandas...")
-    run_command("pip install pandas==2.0.3")
-    
-    # Install streamlit
-    print("Installing streamlit...")
-    run_command("pip install streamlit==1.28.0")
+    run_command(pip_command("cache", "purge"))
     
     print("\n" + "="*50)
     
-    # Step 4: Install other PitchOS dependencies
-    print("Step 4: Installing PitchOS dependencies...")
+    # Step 3: Install compatible versions and PitchOS dependencies in one pip run,
+    # so the resolver sees the pinned numpy/pandas/streamlit alongside everything else
+    print("Step 3: Installing compatible versions and PitchOS dependencies...")
     
     dependencies = [
-        "google-generativeai>=0.3.0",
+        "numpy==1.24.3",
+        "pandas==2.0.3",
+        "streamlit==1.28.0",
+        "google-generativeai>=0.8.0",
         "python-dotenv>=1.0.0",
-        "PyPDF2>=3.0.1",
+        "PyMuPDF>=1.23.0",
+        "pypdf>=3.17.0",
         "python-docx>=0.8.11",
         "plotly>=5.15.0",
         "Pillow>=10.0.0",
@@ -75,14 +65,12 @@ def fix_numpy_pandas_compatibility():
         "typing-extensions>=4.7.0"
     ]
     
-    for dep in dependencies:
-        print(f"Installing {dep}...")
-        run_command(f"pip install {dep}")
+    run_command(pip_command("install", "--no-input", *dependencies))
     
     print("\n" + "="*50)
     
-    # Step 5: Install OCR dependencies (optional)
-    print("Step 5: Installing OCR dependencies (optional)...")
+    # Step 4: Install OCR dependencies (optional)
+    print("Step 4: Installing OCR dependencies (optional)...")
     
     ocr_deps = [
         "opencv-python>=4.8.0",
@@ -90,11 +78,8 @@ def fix_numpy_pandas_compatibility():
         "google-cloud-vision>=3.4.0"
     ]
     
-    for dep in ocr_deps:
-        print(f"Installing {dep}...")
-        success = run_command(f"pip install {dep}")
-        if not success:
-            print(f"⚠️ Failed to install {dep} - OCR features may not work")
+    if not run_command(pip_command("install", "--no-input", *ocr_deps)):
+        print(f"⚠️ Failed to install {', '.join(ocr_deps)} - OCR features may not work")
     
     print("\n" + "="*50)
 
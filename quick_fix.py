@@ -6,9 +6,9 @@ import subprocess
 import sys
 
 def run_command(cmd):
-    """Run command and show output."""
-    print(f"Running: {cmd}")
-    result = subprocess.run(cmd, shell=True, capture_output=True, text=True)
+    """Run command (argument list, no shell) and show output."""
+    print(f"Running: {' '.join(cmd)}")
+    result = subprocess.run(cmd, capture_output=True, text=True)
     if result.returncode == 0:
         print("✅ Success")
     else:
@@ -21,18 +21,18 @@ def main():
     # Fix the numpy/pandas compatibility issue
     print("Fixing numpy/pandas compatibility...")
     
-    # Uninstall and reinstall with compatible versions
+    # Uninstall, then reinstall everything with compatible versions in one resolver run
+    pip = [sys.executable, "-m", "pip"]
     commands = [
-        "pip uninstall numpy pandas streamlit -y",
-        "pip install numpy==1.24.3",
-        "pip install pandas==2.0.3", 
-        "pip install streamlit==1.28.0",
-        "pip install google-generativeai python-dotenv PyPDF2 python-docx plotly Pillow requests pydantic"
+        pip + ["uninstall", "-y", "numpy", "pandas", "streamlit"],
+        pip + ["install", "--no-input", "numpy==1.24.3", "pandas==2.0.3", "streamlit==1.28.0",
+               "google-generativeai>=0.8.0", "python-dotenv", "PyMuPDF", "pypdf", "python-docx",
+               "plotly", "Pillow", "requests", "pydantic"]
     ]
     
     for cmd in commands:
         if not run_command(cmd):
-            print(f"Failed at: {cmd}")
+            print(f"Failed at: {' '.join(cmd)}")
             break
     
     print("\n🎉 Dependencies should be fixed!")
@@ -6,10 +6,10 @@ import subprocess
 import sys
 import os
 
-def install_package(package):
-    """Install a package using pip."""
+def install_packages(packages):
+    """Install packages with a single pip invocation."""
     try:
-        subprocess.check_call([sys.executable, "-m", "pip", "install", package])
+        subprocess.check_call([sys.executable, "-m", "pip", "install", "--no-input", *packages])
         return True
     except subprocess.CalledProcessError:
         return False
@@ -49,12 +49,11 @@ def main():
     if missing_packages:
         print(f"\nInstalling {len(missing_packages)} missing packages...")
         
-        for package in missing_packages:
-            print(f"Installing {package}...")
-            if install_package(package):
-                print(f"✅ {package} installed successfully")
-            else:
-                print(f"❌ Failed to install {package}")
+        print(f"Installing {', '.join(missing_packages)}...")
+        if install_packages(missing_packages):
+            print("✅ Packages installed successfully")
+        else:
+            print("❌ Failed to install packages")
     else:
         print("\n🎉 All OCR dependencies are already installed!")
     
@@ -25,6 +25,17 @@ class Config:
     MODEL_NAME = "gemini-1.5-flash"
     MAX_TOKENS = 8192
     TEMPERATURE = 0.7
+    MAX_CONCURRENCY = int(os.getenv("MAX_CONCURRENCY", 4))  # Parallel Gemini requests per analysis
+    GEMINI_TRANSPORT = os.getenv("GEMINI_TRANSPORT", "grpc")  # HTTP/2 multiplexed over one connection
+    GEMINI_WARMUP = os.getenv("GEMINI_WARMUP", "True").lower() == "true"  # Pre-connect on startup
+    MIN_PITCH_CHARS = 200  # Shorter pitches skip Gemini and get heuristic-only scores
+    MIN_PITCH_WORDS = int(os.getenv("MIN_PITCH_WORDS", 30))
+    CONTEXT_CACHE_MIN_TOKENS = 32768  # Gemini's minimum size for an explicit context cache
+    CONTEXT_CACHE_TTL_SECONDS = 300
+    QA_CONTEXT_CACHE_TTL_SECONDS = 600  # Kept across Q&A runs on the same pitch
+    QA_RESPONSE_CACHE_SIZE = 512  # Q&A responses kept in memory
+    QA_RESPONSE_CACHE_TTL_SECONDS = 24 * 60 * 60
+    QA_DISK_CACHE_DIR = os.getenv("QA_DISK_CACHE_DIR", ".pitchos_cache")  # Used when diskcache is installed
     
     # UI settings
     PAGE_TITLE = "PitchOS - AI Pitch Deck Analyzer"
@@ -79,13 +90,41 @@ class Config:
     OCR_LANGUAGES = ['en']  # EasyOCR supported languages
     OCR_MIN_TEXT_LENGTH = 20  # Minimum text length to consider valid
     OCR_MIN_ALPHA_RATIO = 0.3  # Minimum ratio of alphabetic characters
+    # EasyOCR on CUDA: "true"/"false", or unset to use the GPU when torch sees one
+    OCR_USE_GPU = {"true": True, "false": False}.get(os.getenv("OCR_USE_GPU", "").lower())
+    OCR_PARALLEL_WORKERS = int(os.getenv("OCR_PARALLEL_WORKERS", os.cpu_count() or 4))  # Images processed concurrently
+    OCR_BATCH_SIZE = int(os.getenv("OCR_BATCH_SIZE", 8))  # EasyOCR recognizer batch size for batched decks
+    OCR_CACHE_SIZE = 128  # OCR results kept in memory
+    OCR_CACHE_TTL_SECONDS = 7 * 24 * 60 * 60
+    OCR_DISK_CACHE_DIR = os.getenv("OCR_DISK_CACHE_DIR", ".pitchos_ocr_cache")  # Used when diskcache is installed
+    VISION_UPLOAD_FORMAT = os.getenv("VISION_UPLOAD_FORMAT", "JPEG").upper()  # Image format sent to Google Vision
+    VISION_UPLOAD_QUALITY = int(os.getenv("VISION_UPLOAD_QUALITY", 85))  # JPEG quality for Vision uploads
 
     # Image preprocessing settings
     IMAGE_MAX_WIDTH = 1920
     IMAGE_MAX_HEIGHT = 1080
     IMAGE_QUALITY_THRESHOLD = 0.7  # For blur detection
+    OCR_SKIP_PREPROCESS_THRESHOLD = float(os.getenv("OCR_SKIP_PREPROCESS_THRESHOLD", 0.6))  # Quality above which raw grayscale is tried first
+    FAST_PREPROCESS = os.getenv("FAST_PREPROCESS", "True").lower() == "true"  # Bilateral instead of non-local means denoising
+    IMAGE_CACHE_SIZE = 64  # Preprocessed images kept in memory
+    OPENCV_USE_OPENCL = os.getenv("OPENCV_USE_OPENCL", "True").lower() == "true"  # GPU offload when available
 
     # Supported image formats
     SUPPORTED_IMAGE_FORMATS = ['png', 'jpg', 'jpeg', 'bmp', 'tiff', 'webp']
 
+    # File processing settings
+    FILE_CACHE_SIZE = 32  # Extracted documents kept in memory
+
+    # Analysis response cache
+    RESPONSE_CACHE_SIZE = 512  # Results kept in memory
+    RESPONSE_CACHE_PATH = os.getenv("RESPONSE_CACHE_PATH", ".pitchos_cache.sqlite3")
+    RESPONSE_CACHE_TTL_SECONDS = 24 * 60 * 60
+    SEMANTIC_CACHE_THRESHOLD = float(os.getenv("SEMANTIC_CACHE_THRESHOLD", 0.92))  # Min cosine similarity to reuse
+    EMBEDDING_MODEL = "models/text-embedding-004"
+    EMBEDDING_MAX_CHARS = 8000  # Stay inside the embedding model's input limit
+
+    # Batch analysis (non-interactive jobs at batch pricing)
+    BATCH_MODEL_NAME = os.getenv("BATCH_MODEL_NAME", MODEL_NAME)
+    BATCH_POLL_INTERVAL_SECONDS = 30
+
 config = Config()
@@ -1,13 +1,31 @@
 """File processing utilities for PitchOS."""
 
+import hashlib
 import io
-import PyPDF2
+import re
+import threading
+from collections import OrderedDict
 import docx
 from typing import Optional
+from src.config import config
+
+try:
+    import fitz  # PyMuPDF
+except ImportError:
+    fitz = None
+    from pypdf import PdfReader
+
+# Key pitch elements that validate_content looks for
+_REQUIRED_RE = re.compile(r'problem|solution|market|business', re.IGNORECASE)
+_WS_RE = re.compile(r'\s+')
 
 class FileProcessor:
     """Handles file upload and text extraction."""
     
+    # Extracted text shared across instances, keyed by file content hash
+    _cache: "OrderedDict[bytes, str]" = OrderedDict()
+    _cache_lock = threading.Lock()
+    
     def __init__(self):
         """Initialize file processor."""
         pass
@@ -18,70 +36,84 @@ class FileProcessor:
         if uploaded_file is None:
             return None
         
-        file_type = uploaded_file.type
-        file_content = ""
+        # Read once and hand the bytes to the extractor
+        return self.extract_text(uploaded_file.read(), uploaded_file.type)
+    
+    def extract_text(self, data: bytes, file_type: str) -> str:
+        """Extract text from file bytes of the given MIME type."""
         
         try:
+            # Streamlit reruns re-submit the same upload, so reuse prior extractions
+            digest = hashlib.blake2b(data, digest_size=16)
+            digest.update(file_type.encode())
+            cache_key = digest.digest()
+            with self._cache_lock:
+                if cache_key in self._cache:
+                    self._cache.move_to_end(cache_key)
+                    return self._cache[cache_key]
+            
             if file_type == "application/pdf":
-                file_content = self._extract_pdf_text(uploaded_file)
+                file_content = self._extract_pdf_text(data)
             elif file_type == "text/plain":
-                file_content = self._extract_text_file(uploaded_file)
+                file_content = self._extract_text_file(data)
             elif file_type == "application/vnd.openxmlformats-officedocument.wordprocessingml.document":
-                file_content = self._extract_docx_text(uploaded_file)
+                file_content = self._extract_docx_text(data)
             else:
                 raise ValueError(f"Unsupported file type: {file_type}")
             
+            with self._cache_lock:
+                self._cache[cache_key] = file_content
+                while len(self._cache) > config.FILE_CACHE_SIZE:
+                    self._cache.popitem(last=False)
+            
             return file_content
             
         except Exception as e:
             raise Exception(f"Error processing file: {str(e)}")
     
-    def _extract_pdf_text(self, uploaded_file) -> str:
+    def _extract_pdf_text(self, data: bytes) -> str:
         """Extract text from PDF file."""
-        pdf_reader = PyPDF2.PdfReader(io.BytesIO(uploaded_file.read()))
-        text = ""
-        
-        for page in pdf_reader.pages:
-            text += page.extract_text() + "\n"
+        if fitz is not None:
+            with fitz.open(stream=data, filetype="pdf") as doc:
+                text = "\n".join(page.get_text("text") for page in doc)
+        else:
+            pdf_reader = PdfReader(io.BytesIO(data))
+            text = "\n".join(page.extract_text() or "" for page in pdf_reader.pages)
         
         return text.strip()
     
-    def _extract_text_file(self, uploaded_file) -> str:
+    def _extract_text_file(self, data: bytes) -> str:
         """Extract text from plain text file."""
-        return uploaded_file.read().decode('utf-8')
+        return data.decode('utf-8')
     
-    def _extract_docx_text(self, uploaded_file) -> str:
+    def _extract_docx_text(self, data: bytes) -> str:
         """Extract text from Word document."""
-        doc = docx.Document(io.BytesIO(uploaded_file.read()))
-        text = ""
-        
-        for paragraph in doc.paragraphs:
-            text += paragraph.text + "\n"
+        doc = docx.Document(io.BytesIO(data))
+        text = "\n".join(paragraph.text for paragraph in doc.paragraphs)
         
         return text.strip()
     
     def validate_content(self, content: str) -> bool:
         """Validate that content is suitable for analysis."""
         
-        if not content or len(content.strip()) < 100:
+        # len() is a cheap upper bound, so only strip when it might pass
+        if not content or len(content) < 100 or len(content.strip()) < 100:
             return False
         
-        # Check for minimum required elements
-        content_lower = content.lower()
-        required_elements = ['problem', 'solution', 'market', 'business']
+        # Check for minimum required elements, stopping once enough are found
+        found_elements = set()
+        for match in _REQUIRED_RE.finditer(content):
+            found_elements.add(match.group(0).lower())
+            if len(found_elements) >= 2:  # At least 2 key elements should be present
+                return True
         
-        found_elements = sum(1 for element in required_elements if element in content_lower)
-        
-        return found_elements >= 2  # At least 2 key elements should be present
+        return False
     
     def clean_content(self, content: str) -> str:
         """Clean and normalize content for analysis."""
         
-        # Remove excessive whitespace
-        content = ' '.join(content.split())
-        
-        # Remove special characters that might interfere with analysis
-        content = content.replace('\x00', '')  # Remove null characters
+        # Remove excessive whitespace and null characters
+        content = _WS_RE.sub(' ', content).strip().replace('\x00', '')
         
         # Limit content length to prevent API limits
         max_length = 10000  # Adjust based on API limits
@@ -1,10 +1,38 @@
 """Investor persona simulation system for PitchOS."""
 
+from concurrent.futures import ThreadPoolExecutor
+from string import Template
 from typing import Dict, List, Any
-import google.generativeai as genai
 from src.config import config
+from src.gemini_client import get_model
 from src.models import InvestorReaction, InvestmentLikelihood, DeckSummary
 
+_LIKELIHOOD_LEVELS = {
+    "high": InvestmentLikelihood.HIGH,
+    "medium": InvestmentLikelihood.MEDIUM,
+    "low": InvestmentLikelihood.LOW,
+    "very low": InvestmentLikelihood.VERY_LOW
+}
+
+# Prompt skeleton shared by every persona, parsed once at import
+_PERSONA_PROMPT_TEMPLATE = Template("""
+        $base_prompt
+        
+        PITCH TO ANALYZE:
+        $pitch
+        
+        KEY ELEMENTS SUMMARY:
+        $summary
+        
+        Provide your reaction in this format:
+        REACTION: [Your 2-3 sentence reaction as this investor persona]
+        LIKELIHOOD: [High/Medium/Low/Very Low]
+        CONCERNS: [List your top 3 concerns, separated by semicolons]
+        EXCITEMENT: [Rate 0-10 your excitement level]
+        
+        Stay true to your persona's investment philosophy and risk tolerance.
+        """)
+
 class InvestorPersonaSimulator:
     """Simulates different investor persona reactions to pitches."""
     
@@ -13,55 +41,51 @@ class InvestorPersonaSimulator:
         if not config.GOOGLE_API_KEY:
             raise ValueError("Google API key not found.")
         
-        genai.configure(api_key=config.GOOGLE_API_KEY)
-        self.model = genai.GenerativeModel(config.MODEL_NAME)
-    
-    def simulate_all_personas(self, pitch_content: str, deck_summary: DeckSummary) -> List[InvestorReaction]:
-        """Simulate reactions from all investor personas."""
-        reactions = []
-        
-        for persona_config in config.INVESTOR_PERSONAS:
-            reaction = self._simulate_persona_reaction(
-                persona_config, pitch_content, deck_summary
-            )
-            reactions.append(reaction)
-        
-        return reactions
-    
-    def _simulate_persona_reaction(self, persona_config: Dict[str, Any], 
-                                 pitch_content: str, deck_summary: DeckSummary) -> InvestorReaction:
-        """Simulate a specific investor persona's reaction."""
+        self.model = get_model(config.MODEL_NAME)
         
-        persona_prompts = {
+        # Persona prompts are static, so build the lookup table once
+        self._persona_prompts = {
             "Risk-Averse VC": self._get_risk_averse_prompt(),
             "Visionary Angel": self._get_visionary_angel_prompt(),
             "Corporate Strategic": self._get_corporate_strategic_prompt()
         }
-        
-        base_prompt = persona_prompts.get(persona_config['name'], self._get_default_prompt())
-        
-        full_prompt = f"""
-        {base_prompt}
-        
-        PITCH TO ANALYZE:
-        {pitch_content}
-        
-        KEY ELEMENTS SUMMARY:
-        - Problem: {deck_summary.problem.content}
+        self._default_prompt = self._get_default_prompt()
+    
+    def simulate_all_personas(self, pitch_content: str, deck_summary: DeckSummary) -> List[InvestorReaction]:
+        """Simulate reactions from all investor personas."""
+        # The summary block is identical for every persona, so render it once
+        elements_summary = self._format_elements_summary(deck_summary)
+        
+        # Personas are independent network round-trips, so run them concurrently
+        with ThreadPoolExecutor(max_workers=len(config.INVESTOR_PERSONAS)) as executor:
+            reactions = executor.map(
+                lambda persona_config: self._simulate_persona_reaction(
+                    persona_config, pitch_content, elements_summary
+                ),
+                config.INVESTOR_PERSONAS
+            )
+            return list(reactions)
+    
+    def _format_elements_summary(self, deck_summary: DeckSummary) -> str:
+        """Render the key elements summary shared by all persona prompts."""
+        return f"""- Problem: {deck_summary.problem.content}
         - Solution: {deck_summary.solution.content}
         - Market: {deck_summary.market.content}
         - Traction: {deck_summary.traction.content}
         - Business Model: {deck_summary.business_model.content}
-        - Team: {deck_summary.team.content}
+        - Team: {deck_summary.team.content}"""
+    
+    def _simulate_persona_reaction(self, persona_config: Dict[str, Any], 
+                                 pitch_content: str, elements_summary: str) -> InvestorReaction:
+        """Simulate a specific investor persona's reaction."""
         
-        Provide your reaction in this format:
-        REACTION: [Your 2-3 sentence reaction as this investor persona]
-        LIKELIHOOD: [High/Medium/Low/Very Low]
-        CONCERNS: [List your top 3 concerns, separated by semicolons]
-        EXCITEMENT: [Rate 0-10 your excitement level]
+        base_prompt = self._persona_prompts.get(persona_config['name'], self._default_prompt)
         
-        Stay true to your persona's investment philosophy and risk tolerance.
-        """
+        full_prompt = _PERSONA_PROMPT_TEMPLATE.substitute(
+            base_prompt=base_prompt,
+            pitch=pitch_content,
+            summary=elements_summary
+        )
         
         try:
             response = self.model.generate_content(full_prompt)
@@ -123,36 +147,26 @@ class InvestorPersonaSimulator:
     
     def _parse_persona_response(self, response_text: str, persona_config: Dict[str, Any]) -> InvestorReaction:
         """Parse the AI response into structured data."""
-        lines = response_text.strip().split('\n')
+        fields = {}
+        for line in response_text.strip().split('\n'):
+            key, separator, value = line.partition(':')
+            if separator:
+                fields[key.strip().upper()] = value.strip()
+        
+        reaction = fields.get("REACTION", "Interesting concept, but need more details to make an informed decision.")
+        likelihood = self._parse_likelihood(fields.get("LIKELIHOOD", "medium"))
         
-        reaction = "Interesting concept, but need more details to make an informed decision."
-        likelihood = InvestmentLikelihood.MEDIUM
         concerns = ["Need more information"]
-        excitement = 5.0
+        if "CONCERNS" in fields:
+            concerns = [c.strip() for c in fields["CONCERNS"].split(';') if c.strip()]
         
-        for line in lines:
-            line = line.strip()
-            if line.startswith("REACTION:"):
-                reaction = line.replace("REACTION:", "").strip()
-            elif line.startswith("LIKELIHOOD:"):
-                likelihood_text = line.replace("LIKELIHOOD:", "").strip().lower()
-                if "high" in likelihood_text:
-                    likelihood = InvestmentLikelihood.HIGH
-                elif "very low" in likelihood_text:
-                    likelihood = InvestmentLikelihood.VERY_LOW
-                elif "low" in likelihood_text:
-                    likelihood = InvestmentLikelihood.LOW
-                else:
-                    likelihood = InvestmentLikelihood.MEDIUM
-            elif line.startswith("CONCERNS:"):
-                concerns_text = line.replace("CONCERNS:", "").strip()
-                concerns = [c.strip() for c in concerns_text.split(';') if c.strip()]
-            elif line.startswith("EXCITEMENT:"):
-                try:
-                    excitement = float(line.replace("EXCITEMENT:", "").strip())
-                    excitement = max(0, min(10, excitement))  # Clamp to 0-10
-                except ValueError:
-                    excitement = 5.0
+        excitement = 5.0
+        if "EXCITEMENT" in fields:
+            try:
+                excitement = float(fields["EXCITEMENT"])
+                excitement = max(0, min(10, excitement))  # Clamp to 0-10
+            except ValueError:
+                excitement = 5.0
         
         return InvestorReaction(
             persona=persona_config['name'],
@@ -163,6 +177,21 @@ class InvestorPersonaSimulator:
             excitement_level=excitement
         )
     
+    def _parse_likelihood(self, likelihood_text: str) -> InvestmentLikelihood:
+        """Map a free-text likelihood onto an InvestmentLikelihood level."""
+        normalized = likelihood_text.strip(" []*.").lower()
+        if normalized in _LIKELIHOOD_LEVELS:
+            return _LIKELIHOOD_LEVELS[normalized]
+        
+        # Fall back to a keyword scan for verbose answers
+        if "high" in normalized:
+            return InvestmentLikelihood.HIGH
+        elif "very low" in normalized:
+            return InvestmentLikelihood.VERY_LOW
+        elif "low" in normalized:
+            return InvestmentLikelihood.LOW
+        return InvestmentLikelihood.MEDIUM
+    
     def _get_fallback_reaction(self, persona_config: Dict[str, Any]) -> InvestorReaction:
         """Get fallback reaction when AI fails."""
         fallback_reactions = {
@@ -1,8 +1,14 @@
 """Data models for PitchOS."""
 
-from typing import List, Dict, Optional, Any
-from pydantic import BaseModel, Field
-from enum import Enum
+from typing import Annotated, List, Dict, Iterator, Optional, Any, Union
+import numpy as np
+from pydantic import BaseModel, ConfigDict, Field, TypeAdapter
+from enum import Enum, Flag, auto
+
+try:
+    import msgspec
+except ImportError:
+    msgspec = None
 
 class InvestmentLikelihood(str, Enum):
     """Investment likelihood levels."""
@@ -11,8 +17,18 @@ class InvestmentLikelihood(str, Enum):
     LOW = "Low"
     VERY_LOW = "Very Low"
 
+class PitchFlag(Flag):
+    """Machine-readable pitch red flags; combine with | and test with `in`."""
+    NONE = 0
+    HYPE = auto()
+    VAGUE = auto()
+    NO_MONETIZATION = auto()
+    NO_CUSTOMER = auto()
+
 class PitchElement(BaseModel):
     """Individual pitch deck element."""
+    model_config = ConfigDict(frozen=True)
+    
     content: str
     clarity_score: float = Field(ge=0, le=10)
     completeness_score: float = Field(ge=0, le=10)
@@ -29,8 +45,39 @@ class DeckSummary(BaseModel):
     competition: PitchElement
     vision: PitchElement
 
+# Deck elements in a fixed order, used for columnar score views
+DECK_ELEMENTS = (
+    'problem', 'solution', 'market', 'traction', 'business_model',
+    'team', 'financials', 'competition', 'vision'
+)
+
+class DeckScores:
+    """Quantized columnar view of a DeckSummary's element scores.
+    
+    Scores are stored as uint8 tenths (0-100), which covers the 0-10 range
+    at the one-decimal precision the model reports.
+    """
+    SCALE = 10
+    
+    def __init__(self, deck_summary: DeckSummary):
+        elements = [getattr(deck_summary, name) for name in DECK_ELEMENTS]
+        self.clarity = self._quantize(element.clarity_score for element in elements)
+        self.completeness = self._quantize(element.completeness_score for element in elements)
+    
+    @classmethod
+    def _quantize(cls, scores) -> np.ndarray:
+        return np.fromiter((round(score * cls.SCALE) for score in scores),
+                           dtype=np.uint8, count=len(DECK_ELEMENTS))
+    
+    def to_float(self) -> "tuple[np.ndarray, np.ndarray]":
+        """Return (clarity, completeness) as float32 arrays on the 0-10 scale."""
+        return (self.clarity.astype(np.float32) / self.SCALE,
+                self.completeness.astype(np.float32) / self.SCALE)
+
 class InvestorReaction(BaseModel):
     """Investor persona reaction."""
+    model_config = ConfigDict(frozen=True, extra='forbid')
+    
     persona: str
     avatar: str
     reaction: str
@@ -40,6 +87,8 @@ class InvestorReaction(BaseModel):
 
 class QAItem(BaseModel):
     """Q&A battle item."""
+    model_config = ConfigDict(frozen=True, extra='forbid')
+    
     question: str
     ideal_response: str
     difficulty_level: str
@@ -67,11 +116,53 @@ class TeamProductMarketFit(BaseModel):
 
 class CrowdFeedback(BaseModel):
     """AI crowd feedback item."""
+    model_config = ConfigDict(frozen=True, extra='forbid')
+    
     comment: str
     sentiment: str  # positive, negative, neutral
     emoji: str
     category: str  # technical, business, presentation, etc.
 
+class CrowdFeedbackBatch:
+    """Columnar view over crowd feedback for vectorized aggregation."""
+    
+    def __init__(self, items: List[CrowdFeedback]):
+        self.comments = [item.comment for item in items]
+        self.emoji = [item.emoji for item in items]
+        
+        # Categorical columns are stored as small integer codes into a label table
+        self.sentiment_labels, sentiment = np.unique(
+            [item.sentiment for item in items], return_inverse=True
+        )
+        self.category_labels, category = np.unique(
+            [item.category for item in items], return_inverse=True
+        )
+        self.sentiment = sentiment.astype(np.int8)
+        self.category = category.astype(np.int8)
+    
+    def __len__(self) -> int:
+        return len(self.comments)
+    
+    def iter(self) -> Iterator[CrowdFeedback]:
+        """Iterate the batch as CrowdFeedback items."""
+        for i in range(len(self)):
+            yield CrowdFeedback(
+                comment=self.comments[i],
+                sentiment=self.sentiment_labels[self.sentiment[i]],
+                emoji=self.emoji[i],
+                category=self.category_labels[self.category[i]]
+            )
+    
+    def sentiment_counts(self) -> Dict[str, int]:
+        """Count feedback items per sentiment."""
+        counts = np.bincount(self.sentiment, minlength=len(self.sentiment_labels))
+        return dict(zip(self.sentiment_labels.tolist(), counts.tolist()))
+    
+    def category_counts(self) -> Dict[str, int]:
+        """Count feedback items per category."""
+        counts = np.bincount(self.category, minlength=len(self.category_labels))
+        return dict(zip(self.category_labels.tolist(), counts.tolist()))
+
 class PitchAnalysisResult(BaseModel):
     """Complete pitch analysis result."""
     deck_summary: DeckSummary
@@ -88,3 +179,48 @@ class PitchAnalysisResult(BaseModel):
     visual_communication_score: Optional[float] = Field(ge=0, le=10, default=None)
     storytelling_score: float = Field(ge=0, le=10)
     emotional_hook_score: float = Field(ge=0, le=10)
+
+# Built once so nested serializers are compiled a single time and reused
+_RESULT_ADAPTER = TypeAdapter(PitchAnalysisResult)
+
+def dump_analysis_result(result: PitchAnalysisResult, mode: str = "python") -> Dict[str, Any]:
+    """Serialize an analysis result to plain data via the shared TypeAdapter."""
+    return _RESULT_ADAPTER.dump_python(result, mode=mode)
+
+if msgspec is not None:
+    # C-level mirrors of PitchElement / DeckSummary used only for decoding
+    _Score = Annotated[float, msgspec.Meta(ge=0, le=10)]
+    
+    class _PitchElementStruct(msgspec.Struct):
+        content: str
+        clarity_score: _Score
+        completeness_score: _Score
+    
+    _DeckSummaryStruct = msgspec.defstruct(
+        "_DeckSummaryStruct", [(name, _PitchElementStruct) for name in DECK_ELEMENTS]
+    )
+    _DECK_DECODER = msgspec.json.Decoder(_DeckSummaryStruct)
+
+def _element_from_struct(element) -> PitchElement:
+    """Wrap an already-validated struct without re-running Pydantic validation."""
+    return PitchElement.model_construct(
+        content=element.content,
+        clarity_score=element.clarity_score,
+        completeness_score=element.completeness_score
+    )
+
+def decode_deck_summary(data: Union[str, bytes]) -> DeckSummary:
+    """Decode DeckSummary JSON, using msgspec's typed decoder when available."""
+    if msgspec is None:
+        return DeckSummary.model_validate_json(data)
+    
+    raw = _DECK_DECODER.decode(data)
+    return DeckSummary.model_construct(
+        **{name: _element_from_struct(getattr(raw, name)) for name in DECK_ELEMENTS}
+    )
+
+def pitch_element_from_dict(data: Dict[str, Any]) -> PitchElement:
+    """Validate a decoded element dict into a PitchElement."""
+    if msgspec is None:
+        return PitchElement.model_validate(data)
+    return _element_from_struct(msgspec.convert(data, _PitchElementStruct))
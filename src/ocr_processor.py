@@ -1,16 +1,30 @@
 """Hybrid OCR processor for PitchOS with EasyOCR primary and Google Cloud Vision fallback."""
 
 import base64
-import io
+import hashlib
 import re
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from typing import List, Dict, Tuple, Optional, Any
 import numpy as np
 import cv2
 from PIL import Image
-import easyocr
 import requests
 from src.config import config
 
+try:
+    import diskcache
+except ImportError:
+    diskcache = None
+
+# 3x3 sharpening stencil, built once in the float32 form filter2D uses internally
+_SHARPEN_KERNEL = np.array([[-1, -1, -1], [-1, 9, -1], [-1, -1, -1]], dtype=np.float32)
+
+# ASCII letters, deleted with bytes.translate to count them in one C pass
+_ASCII_ALPHA = bytes(range(65, 91)) + bytes(range(97, 123))
+
 class OCRResult:
     """OCR result with metadata."""
     
@@ -28,9 +42,14 @@ class OCRResult:
         if not self.text or len(self.text.strip()) < config.OCR_MIN_TEXT_LENGTH:
             return False
         
-        # Check ratio of alphabetic characters
-        alpha_chars = sum(1 for c in self.text if c.isalpha())
-        total_chars = len(self.text.replace(' ', ''))
+        # Check ratio of alphabetic characters; ASCII text (the common case) is
+        # counted in C, other scripts fall back to per-character isalpha()
+        if self.text.isascii():
+            data = self.text.encode('ascii')
+            alpha_chars = len(data) - len(data.translate(None, _ASCII_ALPHA))
+        else:
+            alpha_chars = sum(1 for c in self.text if c.isalpha())
+        total_chars = len(self.text) - self.text.count(' ')
         
         if total_chars == 0:
             return False
@@ -41,31 +60,110 @@ class OCRResult:
 class HybridOCRProcessor:
     """Hybrid OCR processor with EasyOCR primary and Google Cloud Vision fallback."""
     
-    def __init__(self):
-        """Initialize OCR processor."""
+    # EasyOCR readers shared across instances, keyed by (languages, gpu); each load is seconds and ~500 MB
+    _reader_cache: Dict[Tuple[Tuple[str, ...], bool], Any] = {}
+    _reader_cache_lock = threading.Lock()
+    _warmed_readers: set = set()  # ids of readers already warmed up in this process
+    # One reader serves every thread; torch already parallelizes each readtext call
+    _easyocr_lock = threading.Lock()
+    
+    # Valid OCR results by image content hash, shared across instances; re-uploaded decks
+    # and repeated slides skip the pipeline. Backed by diskcache when installed
+    _result_cache: "OrderedDict[str, dict]" = OrderedDict()
+    _result_cache_lock = threading.Lock()
+    _result_disk = None
+    
+    def __init__(self, gpu: Optional[bool] = None, warm_up: bool = True):
+        """Initialize OCR processor.
+        
+        gpu overrides config.OCR_USE_GPU; warm_up=False defers the warm-up to start_warm_up(),
+        e.g. when the processor is built in a process that will fork.
+        """
         self.easyocr_reader = None
-        self._init_easyocr()
+        # Keep-alive HTTPS connections for Vision fallbacks, one per concurrent batch worker
+        self._session = requests.Session()
+        self._session.mount("https://", requests.adapters.HTTPAdapter(pool_maxsize=config.OCR_PARALLEL_WORKERS))
+        self._init_easyocr(gpu)
+        if warm_up:
+            self.start_warm_up()
     
-    def _init_easyocr(self):
+    def _init_easyocr(self, gpu: Optional[bool] = None):
         """Initialize EasyOCR reader."""
         try:
-            self.easyocr_reader = easyocr.Reader(config.OCR_LANGUAGES, gpu=False)
+            # Imported here: EasyOCR pulls in PyTorch (seconds, hundreds of MB), which only OCR users should pay for
+            import easyocr
+            
+            if gpu is None:
+                gpu = config.OCR_USE_GPU
+            if gpu is None:
+                import torch  # EasyOCR dependency
+                gpu = torch.cuda.is_available()
+            
+            key = (tuple(config.OCR_LANGUAGES), gpu)
+            with self._reader_cache_lock:
+                if key not in self._reader_cache:
+                    self._reader_cache[key] = easyocr.Reader(config.OCR_LANGUAGES, gpu=gpu)
+                self.easyocr_reader = self._reader_cache[key]
         except Exception as e:
             print(f"Warning: Failed to initialize EasyOCR: {e}")
             self.easyocr_reader = None
     
+    def start_warm_up(self):
+        """Pay the first readtext and OpenCV setup costs in the background, once per reader."""
+        if self.easyocr_reader is None:
+            return
+        with self._reader_cache_lock:
+            if id(self.easyocr_reader) in self._warmed_readers:
+                return
+            self._warmed_readers.add(id(self.easyocr_reader))
+        threading.Thread(target=self._warm_up, name="easyocr-warmup", daemon=True).start()
+    
+    def _warm_up(self):
+        """Run a dummy image through preprocessing and EasyOCR."""
+        try:
+            blank = np.zeros((32, 32), dtype=np.uint8)
+            self._enhance(blank)
+            with self._easyocr_lock:
+                self.easyocr_reader.readtext(blank)
+        except Exception:
+            pass
+    
     def process_image(self, image: Image.Image, filename: str = "") -> OCRResult:
         """Process single image with hybrid OCR approach."""
-        import time
+        key = self._cache_key(image)
+        cached = self._get_cached_result(key)
+        if cached is not None:
+            return cached
         
-        # Preprocess image
-        processed_image = self._preprocess_image(image)
+        result = self._process_image(image)
+        self._store_result(key, result)
+        return result
+    
+    def _process_image(self, image: Image.Image) -> OCRResult:
+        """Run the OCR pipeline on one image, bypassing the result cache."""
+        gray = self._prepare_gray(image)
         
-        # Try EasyOCR first
+        # Sharp inputs (clean slide exports) usually read fine as-is, so try them
+        # before paying for denoise+CLAHE+sharpen
         start_time = time.time()
+        if self._quality_from_gray(gray) > config.OCR_SKIP_PREPROCESS_THRESHOLD:
+            easyocr_result = self._extract_with_easyocr(gray)
+            if easyocr_result.is_valid:
+                easyocr_result.processing_time = time.time() - start_time
+                return easyocr_result
+        
+        # Preprocess image
+        processed_image = self._enhance(gray)
+        
+        # Try EasyOCR on the preprocessed image
         easyocr_result = self._extract_with_easyocr(processed_image)
         easyocr_time = time.time() - start_time
         
+        return self._with_vision_fallback(processed_image, easyocr_result, easyocr_time)
+    
+    def _with_vision_fallback(self, processed_image: np.ndarray, easyocr_result: OCRResult,
+                              easyocr_time: float) -> OCRResult:
+        """Return the EasyOCR result if valid, otherwise try Google Cloud Vision."""
         if easyocr_result.is_valid:
             easyocr_result.processing_time = easyocr_time
             return easyocr_result
@@ -91,89 +189,212 @@ class HybridOCRProcessor:
     
     def process_batch(self, images: List[Tuple[Image.Image, str]]) -> List[OCRResult]:
         """Process multiple images in batch."""
-        results = []
+        keys = [self._cache_key(image) for image, _ in images]
+        results = [self._get_cached_result(key) for key in keys]
+        misses = [index for index, result in enumerate(results) if result is None]
         
-        for image, filename in images:
-            result = self.process_image(image, filename)
-            results.append(result)
+        if len(misses) == 1:
+            results[misses[0]] = self._process_image(images[misses[0]][0])
+        elif misses:
+            # OpenCV preprocessing releases the GIL and Vision fallbacks wait on HTTP, so those
+            # steps overlap across images; EasyOCR runs batched in between. map keeps input order
+            with ThreadPoolExecutor(max_workers=min(len(misses), config.OCR_PARALLEL_WORKERS)) as executor:
+                processed = list(executor.map(lambda index: self._preprocess_image(images[index][0]), misses))
+                easyocr_results = self._extract_batch_with_easyocr(processed)
+                fresh = executor.map(
+                    lambda args: self._with_vision_fallback(args[0], *args[1]),
+                    zip(processed, easyocr_results)
+                )
+                for index, result in zip(misses, fresh):
+                    results[index] = result
         
+        for index in misses:
+            self._store_result(keys[index], results[index])
         return results
     
-    def _preprocess_image(self, image: Image.Image) -> Image.Image:
-        """Preprocess image to improve OCR accuracy."""
-        # Convert PIL to OpenCV format
-        cv_image = cv2.cvtColor(np.array(image), cv2.COLOR_RGB2BGR)
+    @staticmethod
+    def _cache_key(image: Image.Image) -> str:
+        """Hash the decoded pixels together with the settings that change OCR output."""
+        digest = hashlib.blake2b(image.tobytes(), digest_size=16)
+        digest.update(f"{image.mode}|{image.size}|{config.OCR_LANGUAGES}|{config.FAST_PREPROCESS}".encode())
+        return digest.hexdigest()
+    
+    @classmethod
+    def _disk_results(cls):
+        """Open the on-disk result cache on first use, or None if diskcache isn't installed."""
+        if diskcache is not None and cls._result_disk is None:
+            try:
+                cls._result_disk = diskcache.Cache(config.OCR_DISK_CACHE_DIR)
+            except Exception:
+                return None
+        return cls._result_disk
+    
+    def _get_cached_result(self, key: str) -> Optional[OCRResult]:
+        """Return a fresh OCRResult for a cached image, looking in memory then on disk."""
+        with self._result_cache_lock:
+            fields = self._result_cache.get(key)
+            if fields is not None:
+                self._result_cache.move_to_end(key)
+        
+        if fields is None:
+            disk = self._disk_results()
+            fields = disk.get(key) if disk is not None else None
+            if fields is None:
+                return None
+            self._remember_result(key, fields)
+        
+        # Callers may append issues, so each hit gets its own object
+        return OCRResult(fields["text"], fields["method"], fields["confidence"],
+                         fields["processing_time"], list(fields["issues"]))
+    
+    def _store_result(self, key: str, result: OCRResult) -> None:
+        """Cache a valid result in memory and, when available, on disk."""
+        if not result.is_valid:
+            return  # Failures may be transient (e.g. Vision errors), so they are retried
+        
+        fields = {
+            "text": result.text,
+            "method": result.method,
+            "confidence": result.confidence,
+            "processing_time": result.processing_time,
+            "issues": list(result.issues)
+        }
+        self._remember_result(key, fields)
+        
+        disk = self._disk_results()
+        if disk is not None:
+            disk.set(key, fields, expire=config.OCR_CACHE_TTL_SECONDS)
+    
+    def _remember_result(self, key: str, fields: dict) -> None:
+        """Insert into the in-process LRU, evicting the oldest entries."""
+        with self._result_cache_lock:
+            self._result_cache[key] = fields
+            self._result_cache.move_to_end(key)
+            while len(self._result_cache) > config.OCR_CACHE_SIZE:
+                self._result_cache.popitem(last=False)
+    
+    def _preprocess_image(self, image: Image.Image) -> np.ndarray:
+        """Preprocess image to improve OCR accuracy; returns a grayscale array."""
+        return self._enhance(self._prepare_gray(image))
+    
+    def _prepare_gray(self, image: Image.Image) -> np.ndarray:
+        """Convert to grayscale and shrink to the configured maximum size."""
+        gray = self._to_gray(image)
         
-        # Resize if too large
-        height, width = cv_image.shape[:2]
+        # Resize if too large (after graying, so only one channel is resampled)
+        height, width = gray.shape
         if width > config.IMAGE_MAX_WIDTH or height > config.IMAGE_MAX_HEIGHT:
             scale = min(config.IMAGE_MAX_WIDTH / width, config.IMAGE_MAX_HEIGHT / height)
             new_width = int(width * scale)
             new_height = int(height * scale)
-            cv_image = cv2.resize(cv_image, (new_width, new_height), interpolation=cv2.INTER_AREA)
+            gray = cv2.resize(gray, (new_width, new_height), interpolation=cv2.INTER_AREA)
         
-        # Convert to grayscale
-        gray = cv2.cvtColor(cv_image, cv2.COLOR_BGR2GRAY)
-        
-        # Apply denoising
-        denoised = cv2.fastNlMeansDenoising(gray)
+        return gray
+    
+    def _enhance(self, gray: np.ndarray) -> np.ndarray:
+        """Denoise, boost contrast and sharpen a grayscale array."""
+        # Apply denoising; bilateral keeps text edges at a fraction of non-local means' cost
+        if config.FAST_PREPROCESS:
+            denoised = cv2.bilateralFilter(gray, 5, 50, 50)
+        else:
+            denoised = cv2.fastNlMeansDenoising(gray)
         
         # Enhance contrast using CLAHE
         clahe = cv2.createCLAHE(clipLimit=2.0, tileGridSize=(8, 8))
         enhanced = clahe.apply(denoised)
         
         # Apply sharpening
-        kernel = np.array([[-1, -1, -1], [-1, 9, -1], [-1, -1, -1]])
-        sharpened = cv2.filter2D(enhanced, -1, kernel)
+        sharpened = cv2.filter2D(enhanced, -1, _SHARPEN_KERNEL)
         
-        # Convert back to PIL
-        processed_image = Image.fromarray(sharpened)
-        
-        return processed_image
+        return sharpened
+    
+    @staticmethod
+    def _to_gray(image: Image.Image) -> np.ndarray:
+        """Convert a PIL image to a grayscale array in one pass, without a BGR copy."""
+        if image.mode == 'L':
+            return np.asarray(image)
+        rgb = np.asarray(image if image.mode == 'RGB' else image.convert('RGB'))
+        return cv2.cvtColor(rgb, cv2.COLOR_RGB2GRAY)
     
-    def _extract_with_easyocr(self, image: Image.Image) -> OCRResult:
+    def _extract_with_easyocr(self, image: np.ndarray) -> OCRResult:
         """Extract text using EasyOCR."""
         if not self.easyocr_reader:
             return OCRResult("", "easyocr", 0.0, 0.0, ["EasyOCR not initialized"])
         
         try:
-            # Convert PIL to numpy array
-            img_array = np.array(image)
-            
             # Extract text
-            results = self.easyocr_reader.readtext(img_array)
+            with self._easyocr_lock:
+                results = self.easyocr_reader.readtext(image)
             
-            # Combine all text
-            text_parts = []
-            total_confidence = 0.0
-            
-            for (bbox, text, confidence) in results:
-                if confidence > 0.3:  # Filter low confidence results
-                    text_parts.append(text)
-                    total_confidence += confidence
-            
-            combined_text = ' '.join(text_parts)
-            avg_confidence = total_confidence / len(results) if results else 0.0
-            
-            return OCRResult(
-                text=combined_text,
-                method="easyocr",
-                confidence=avg_confidence
-            )
+            return self._easyocr_result(results)
             
         except Exception as e:
             return OCRResult("", "easyocr", 0.0, 0.0, [f"EasyOCR error: {str(e)}"])
     
-    def _extract_with_google_vision(self, image: Image.Image) -> OCRResult:
+    def _extract_batch_with_easyocr(self, images: List[np.ndarray]) -> List[Tuple[OCRResult, float]]:
+        """Extract text from several images with batched EasyOCR calls; returns (result, seconds) per image."""
+        if not self.easyocr_reader:
+            return [(self._extract_with_easyocr(image), 0.0) for image in images]
+        
+        # The detector stacks a batch into one tensor, so only same-sized images share a call
+        groups: Dict[tuple, List[int]] = {}
+        for index, image in enumerate(images):
+            groups.setdefault(image.shape, []).append(index)
+        
+        extracted: List[Tuple[OCRResult, float]] = [None] * len(images)
+        for indices in groups.values():
+            start_time = time.time()
+            try:
+                with self._easyocr_lock:
+                    if len(indices) == 1:
+                        batch = [self.easyocr_reader.readtext(images[indices[0]])]
+                    else:
+                        batch = self.easyocr_reader.readtext_batched(
+                            [images[index] for index in indices], batch_size=config.OCR_BATCH_SIZE
+                        )
+                elapsed = (time.time() - start_time) / len(indices)
+                for index, results in zip(indices, batch):
+                    extracted[index] = (self._easyocr_result(results), elapsed)
+            except Exception as e:
+                for index in indices:
+                    extracted[index] = (OCRResult("", "easyocr", 0.0, 0.0, [f"EasyOCR error: {str(e)}"]), 0.0)
+        
+        return extracted
+    
+    def _easyocr_result(self, results: list) -> OCRResult:
+        """Combine EasyOCR detections into one result, dropping low-confidence text."""
+        text_parts = []
+        total_confidence = 0.0
+        
+        for (bbox, text, confidence) in results:
+            if confidence > 0.3:  # Filter low confidence results
+                text_parts.append(text)
+                total_confidence += confidence
+        
+        combined_text = ' '.join(text_parts)
+        avg_confidence = total_confidence / len(results) if results else 0.0
+        
+        return OCRResult(
+            text=combined_text,
+            method="easyocr",
+            confidence=avg_confidence
+        )
+    
+    def _extract_with_google_vision(self, image: np.ndarray) -> OCRResult:
         """Extract text using Google Cloud Vision API."""
         if not config.GOOGLE_CLOUD_VISION_API_KEY:
             return OCRResult("", "google_vision", 0.0, 0.0, ["Google Cloud Vision API key not configured"])
         
         try:
-            # Convert image to base64
-            buffer = io.BytesIO()
-            image.save(buffer, format='PNG')
-            image_base64 = base64.b64encode(buffer.getvalue()).decode('utf-8')
+            # Encode straight from the grayscale array; JPEG is several times smaller than PNG
+            if config.VISION_UPLOAD_FORMAT == 'JPEG':
+                params = [cv2.IMWRITE_JPEG_QUALITY, config.VISION_UPLOAD_QUALITY, cv2.IMWRITE_JPEG_OPTIMIZE, 1]
+            else:
+                params = []
+            ok, encoded = cv2.imencode(f".{config.VISION_UPLOAD_FORMAT.lower()}", image, params)
+            if not ok:
+                raise ValueError(f"Could not encode image as {config.VISION_UPLOAD_FORMAT}")
+            image_base64 = base64.b64encode(encoded).decode('ascii')
             
             # Prepare API request
             url = f"https://vision.googleapis.com/v1/images:annotate?key={config.GOOGLE_CLOUD_VISION_API_KEY}"
@@ -195,7 +416,7 @@ class HybridOCRProcessor:
             }
             
             # Make API call
-            response = requests.post(url, json=payload)
+            response = self._session.post(url, json=payload)
             response.raise_for_status()
             
             result = response.json()
@@ -229,27 +450,24 @@ class HybridOCRProcessor:
     def get_image_quality_score(self, image: Image.Image) -> float:
         """Calculate image quality score for OCR suitability."""
         try:
-            # Convert to OpenCV format
-            cv_image = cv2.cvtColor(np.array(image), cv2.COLOR_RGB2BGR)
-            gray = cv2.cvtColor(cv_image, cv2.COLOR_BGR2GRAY)
-            
-            # Calculate Laplacian variance (blur detection)
-            laplacian_var = cv2.Laplacian(gray, cv2.CV_64F).var()
-            
-            # Normalize to 0-1 scale
-            quality_score = min(laplacian_var / 1000.0, 1.0)
-            
-            return quality_score
-            
+            return self._quality_from_gray(self._to_gray(image))
         except Exception:
             return 0.5  # Default medium quality
     
+    @staticmethod
+    def _quality_from_gray(gray: np.ndarray) -> float:
+        """Blur score of a grayscale array from its Laplacian variance, normalized to 0-1."""
+        laplacian_var = cv2.Laplacian(gray, cv2.CV_64F).var()
+        return min(laplacian_var / 1000.0, 1.0)
+    
     def suggest_image_improvements(self, image: Image.Image) -> List[str]:
         """Suggest improvements for better OCR results."""
         suggestions = []
         
         try:
-            quality_score = self.get_image_quality_score(image)
+            # One grayscale buffer serves both the blur and brightness checks
+            gray = self._to_gray(image)
+            quality_score = self._quality_from_gray(gray)
             
             if quality_score < config.IMAGE_QUALITY_THRESHOLD:
                 suggestions.append("Image appears blurry - try taking a sharper photo")
@@ -259,10 +477,9 @@ class HybridOCRProcessor:
             if width < 800 or height < 600:
                 suggestions.append("Image resolution is low - try using a higher resolution")
             
-            # Check if image is too dark or too bright
-            cv_image = cv2.cvtColor(np.array(image), cv2.COLOR_RGB2BGR)
-            gray = cv2.cvtColor(cv_image, cv2.COLOR_BGR2GRAY)
-            mean_brightness = np.mean(gray)
+            # Check if image is too dark or too bright; every 8th pixel in each
+            # direction classifies the same while touching 64x less memory
+            mean_brightness = float(gray[::8, ::8].mean())
             
             if mean_brightness < 50:
                 suggestions.append("Image is too dark - try better lighting")
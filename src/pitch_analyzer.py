@@ -2,66 +2,400 @@
 
 import re
 import json
-from typing import Dict, List, Any, Optional
+import asyncio
+import logging
+import random
+import threading
+from typing import Dict, List, Any, Optional, Tuple, TypedDict
+import numpy as np
 import google.generativeai as genai
 from src.config import config
+from src.gemini_client import create_context_cache, get_model, run_async
 from src.models import (
     PitchAnalysisResult, DeckSummary, PitchElement, InvestorReaction,
     VCQABattle, QAItem, IdeaValidationReport, TeamProductMarketFit,
-    CrowdFeedback, InvestmentLikelihood
+    CrowdFeedback, InvestmentLikelihood, PitchFlag, DeckScores, decode_deck_summary, pitch_element_from_dict
 )
+from src.response_cache import ResponseCache
+from src.vc_qa_battle import VCQABattleGenerator
+
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
+logger = logging.getLogger(__name__)
+
+class _PersonaReactionSchema(TypedDict):
+    """Structured-output schema for one persona in the batched reactions prompt."""
+    persona: str
+    reaction: str
+    likelihood: str
+    concerns: List[str]
+    excitement: float
+
+_LIKELIHOOD_LEVELS = {level.value.lower(): level for level in InvestmentLikelihood}
+
+def _object_schema(model) -> "genai.protos.Schema":
+    """Gemini response schema for a flat Pydantic model of str/float fields."""
+    field_types = {str: genai.protos.Type.STRING, float: genai.protos.Type.NUMBER}
+    return genai.protos.Schema(
+        type=genai.protos.Type.OBJECT,
+        properties={
+            name: genai.protos.Schema(type=field_types[field.annotation])
+            for name, field in model.model_fields.items()
+        },
+        required=list(model.model_fields)
+    )
+
+# Structured-output schema for deck extraction, mirroring DeckSummary
+_DECK_SUMMARY_SCHEMA = genai.protos.Schema(
+    type=genai.protos.Type.OBJECT,
+    properties={name: _object_schema(PitchElement) for name in DeckSummary.model_fields},
+    required=list(DeckSummary.model_fields)
+)
+
+# Structured-output schema for the single "analyze everything" request
+_COMBINED_ANALYSIS_SCHEMA = genai.protos.Schema(
+    type=genai.protos.Type.OBJECT,
+    properties={
+        "deck_summary": _DECK_SUMMARY_SCHEMA,
+        "investor_reactions": genai.protos.Schema(
+            type=genai.protos.Type.ARRAY,
+            items=genai.protos.Schema(
+                type=genai.protos.Type.OBJECT,
+                properties={
+                    "persona": genai.protos.Schema(type=genai.protos.Type.STRING),
+                    "reaction": genai.protos.Schema(type=genai.protos.Type.STRING),
+                    "likelihood": genai.protos.Schema(type=genai.protos.Type.STRING),
+                    "concerns": genai.protos.Schema(
+                        type=genai.protos.Type.ARRAY,
+                        items=genai.protos.Schema(type=genai.protos.Type.STRING)
+                    ),
+                    "excitement": genai.protos.Schema(type=genai.protos.Type.NUMBER)
+                },
+                required=list(_PersonaReactionSchema.__annotations__)
+            )
+        ),
+        "vc_questions": genai.protos.Schema(
+            type=genai.protos.Type.ARRAY,
+            items=_object_schema(QAItem)
+        )
+    },
+    required=["deck_summary", "investor_reactions", "vc_questions"]
+)
+
+# Stable leading instruction shared by every prompt, so the prefix is identical across calls
+_ANALYST_INSTRUCTION = (
+    "You are an experienced venture capital analyst reviewing a startup pitch. "
+    "Base every answer strictly on the pitch content provided."
+)
+
+_BLANK_RUN_RE = re.compile(r'[ \t\f\v]+')
+_LINE_BREAK_RE = re.compile(r' ?\n[\s]*')
+
+# Narrative / emotional indicator categories, one named group per category.
+# Scoring patterns are matched against the lowercased pitch, so they are case-sensitive.
+_STORY_RE = re.compile(
+    r'(?P<origin>\b(?:story|journey|began|started|founded)\b)'
+    r'|(?P<problem>\b(?:problem|pain|frustration|challenge)\b)'
+    r'|(?P<solution>\b(?:solution|answer|solve|fix)\b)'
+    r'|(?P<vision>\b(?:vision|future|imagine|dream)\b)'
+)
+_STORY_CATEGORIES = len(_STORY_RE.groupindex)
+_EMOTION_RE = re.compile(
+    r'(?P<feeling>\b(?:passionate|excited|love|hate|frustrated|amazing|incredible)\b)'
+    r'|(?P<impact>\b(?:transform|change|impact|difference|better|improve)\b)'
+    r'|(?P<people>\b(?:people|users|customers|lives|world|society)\b)'
+)
+# Longest terms first so a shorter term can't shadow a longer one in the alternation
+_HYPE_RE = re.compile(
+    r'\b(?:' + '|'.join(sorted((re.escape(term.lower()) for term in config.HYPE_TERMS),
+                               key=len, reverse=True)) + r')\b'
+)
+_SUPERLATIVE_RE = re.compile(
+    r'\b(?:best|greatest|ultimate|revolutionary|groundbreaking|unprecedented)\b'
+)
+
+# Keywords counted (as raw substrings) towards each startup archetype
+_ARCHETYPE_INDICATORS = {
+    "Builder": ["product", "technology", "engineering", "development", "build"],
+    "Visionary": ["future", "vision", "transform", "revolution", "change the world"],
+    "Hustler": ["sales", "growth", "customers", "revenue", "market"],
+    "Academic": ["research", "study", "analysis", "data", "scientific"],
+    "Disruptor": ["disrupt", "traditional", "outdated", "new way", "challenge"],
+    "Optimizer": ["efficiency", "optimize", "improve", "better", "streamline"],
+    "Connector": ["network", "platform", "connect", "community", "social"],
+    "Researcher": ["insights", "discovery", "findings", "investigation", "explore"]
+}
+
+# Terms checked by _detect_pitch_flags, grouped by the flag they feed
+_FLAG_TERMS = {
+    "hype": config.HYPE_TERMS,
+    "vague": ["synergy", "leverage", "optimize", "streamline", "innovative"],
+    "monetization": ["revenue", "monetization"],
+    "customer": ["customer", "user"]
+}
+
+class _KeywordScanner:
+    """Find every occurrence of a fixed keyword set in one pass over lowercased text."""
+
+    def __init__(self, groups: Dict[str, List[str]]):
+        # Lowercase keyword -> (group, keyword) pairs reported for each occurrence
+        self._keywords: Dict[str, List[tuple]] = {}
+        for group, words in groups.items():
+            for word in words:
+                self._keywords.setdefault(word.lower(), []).append((group, word))
+
+        if ahocorasick is not None:
+            self._automaton = ahocorasick.Automaton()
+            for word, payloads in self._keywords.items():
+                self._automaton.add_word(word, payloads)
+            self._automaton.make_automaton()
+        else:
+            # Zero-width lookahead reports overlapping keywords too, longest first per position
+            self._automaton = None
+            alternation = '|'.join(map(re.escape, sorted(self._keywords, key=len, reverse=True)))
+            self._regex = re.compile(f'(?=({alternation}))')
+
+    def iter(self, text_lower: str):
+        """Yield (group, keyword) for every keyword occurrence in text_lower."""
+        if self._automaton is not None:
+            for _, payloads in self._automaton.iter(text_lower):
+                yield from payloads
+        else:
+            for match in self._regex.finditer(text_lower):
+                yield from self._keywords[match.group(1)]
+
+_ARCHETYPE_SCANNER = _KeywordScanner(_ARCHETYPE_INDICATORS)
+_FLAG_SCANNER = _KeywordScanner(_FLAG_TERMS)
+
+# Readiness weights per element, in DECK_ELEMENTS order
+_READINESS_WEIGHTS = np.array([
+    0.15,  # problem
+    0.15,  # solution
+    0.12,  # market
+    0.18,  # traction
+    0.12,  # business_model
+    0.10,  # team
+    0.10,  # financials
+    0.05,  # competition
+    0.03   # vision
+], dtype=np.float32)
+
+# Crowd feedback pool; CrowdFeedback is frozen, so instances are shared across results
+_BASE_FEEDBACK = tuple(CrowdFeedback(**item) for item in [
+    {"comment": "🔥 This pitch just woke up my inner founder. Let's go!", "sentiment": "positive", "emoji": "🔥", "category": "motivation"},
+    {"comment": "A bit too much fluff, bro. Where's the MVP?", "sentiment": "negative", "emoji": "🤔", "category": "technical"},
+    {"comment": "Great idea, but needs a co-founder with tech chops.", "sentiment": "neutral", "emoji": "💡", "category": "team"},
+    {"comment": "Reminds me of Figma's early deck. Huge potential.", "sentiment": "positive", "emoji": "🚀", "category": "comparison"},
+    {"comment": "Market sizing assumptions seem optimistic. Show me the data.", "sentiment": "negative", "emoji": "📊", "category": "business"}
+])
+
+# In expert mode, add more technical feedback
+_EXPERT_FEEDBACK = _BASE_FEEDBACK + tuple(CrowdFeedback(**item) for item in [
+    {"comment": "Unit economics don't add up. CAC > LTV is concerning.", "sentiment": "negative", "emoji": "💰", "category": "financials"},
+    {"comment": "Competitive moat isn't defensible long-term.", "sentiment": "negative", "emoji": "🏰", "category": "strategy"}
+])
+
+# Common OCR character substitutions, applied in a single pass
+_OCR_MAP = {
+    '0': 'O',   # Zero to O
+    '1': 'I',   # One to I (in context)
+    '5': 'S',   # Five to S (in context)
+    '8': 'B',   # Eight to B (in context)
+    'rn': 'm',  # Common OCR error
+    'cl': 'd',  # Common OCR error
+    'vv': 'w',  # Common OCR error
+}
+_OCR_RE = re.compile(r'\b[0158]\b|rn|cl|vv', re.IGNORECASE)
+
+# Multiple newlines to double, multiple spaces to single
+_OCR_WS_RE = re.compile(r'\n\s*\n| +')
+
+# Strips every line and drops blank ones in one pass
+_LINE_TRIM_RE = re.compile(r'[^\S\n]*\n\s*')
+
+# A line of at most three words mentioning a common slide section is treated as a header
+_SECTION_RE = re.compile(
+    r'^(?=[^\n]*?(?:problem|solution|market|traction|business model|team|financial'
+    r'|competition|vision|ask|funding|revenue|customer|growth))'
+    r'\S+(?:[^\S\n]+\S+){0,2}$',
+    re.MULTILINE | re.IGNORECASE
+)
+
+class _PitchScanContext:
+    """Views of the pitch text shared by the heuristic scorers, computed once per analysis."""
+
+    def __init__(self, raw: str):
+        self.raw = raw
+        self.lower = raw.lower()
+        self.words = raw.split()
+
+class _PitchSession:
+    """Model and shared prompt prefix used by every Gemini call in one analysis."""
+
+    def __init__(self, model, prefix: str, pitch_content: str, semaphore: asyncio.Semaphore):
+        self.model = model
+        self.prefix = prefix
+        self.pitch_content = pitch_content
+        self.semaphore = semaphore
 
 class PitchAnalyzer:
     """Main pitch deck analyzer using Gemini AI."""
     
+    # Completed analyses shared across instances
+    _response_cache: Optional[ResponseCache] = None
+    _warmed_up = False
+    
     def __init__(self):
         """Initialize the analyzer with Gemini AI."""
         if not config.GOOGLE_API_KEY:
             raise ValueError("Google API key not found. Please set GOOGLE_API_KEY in your .env file.")
         
-        genai.configure(api_key=config.GOOGLE_API_KEY)
-        self.model = genai.GenerativeModel(config.MODEL_NAME)
+        self.model = get_model(config.MODEL_NAME)
+        
+        if PitchAnalyzer._response_cache is None:
+            PitchAnalyzer._response_cache = ResponseCache()
+        
+        # Pay the connection handshake off the request path, once per process
+        if config.GEMINI_WARMUP and not PitchAnalyzer._warmed_up:
+            PitchAnalyzer._warmed_up = True
+            threading.Thread(target=self._warm_up, daemon=True).start()
+    
+    def _warm_up(self) -> None:
+        """Open the Gemini connection ahead of the first analysis."""
+        try:
+            # count_tokens is free and goes over the same channel as the sync calls
+            self.model.count_tokens("ping")
+        except Exception:
+            pass  # The first real request will simply connect itself
+    
+    def analyze_pitch(self, pitch_content: str, mode: str = "expert", source_type: str = "text",
+                      semantic_cache: bool = False) -> PitchAnalysisResult:
+        """Analyze a complete pitch deck.
+        
+        semantic_cache=True also reuses the analysis of a near-duplicate earlier pitch; it is
+        opt-in because an edited resubmission is usually similar enough to match.
+        """
+        return run_async(self.analyze_pitch_async(pitch_content, mode, source_type, semantic_cache))
     
-    def analyze_pitch(self, pitch_content: str, mode: str = "expert", source_type: str = "text") -> PitchAnalysisResult:
-        """Analyze a complete pitch deck."""
+    async def analyze_pitch_async(self, pitch_content: str, mode: str = "expert",
+                                  source_type: str = "text", semantic_cache: bool = False) -> PitchAnalysisResult:
+        """Analyze a complete pitch deck with one combined Gemini request."""
+
+        # Repeat submissions of the same pitch skip every Gemini round trip
+        cache_key = ResponseCache.make_key(pitch_content, mode, source_type)
+        cached_result = self._response_cache.get(cache_key)
+        if cached_result is not None:
+            return cached_result
+
+        pitch_content = self._prepare_pitch(pitch_content, source_type)
+
+        # Heuristic scorers share one lowercased copy of the pitch
+        ctx = _PitchScanContext(pitch_content)
+
+        # Inputs too short to carry signal get a heuristic-only result without any Gemini call
+        gate_reason = self._gate_reason(ctx)
+        if gate_reason:
+            logger.info("Pitch analysis gated: %s", gate_reason)
+            return self._assemble_result(
+                ctx, mode,
+                self._basic_element_extraction(pitch_content),
+                [self._get_fallback_reaction(persona) for persona in config.INVESTOR_PERSONAS],
+                self._get_fallback_qa_battle(),
+                self._scan_heuristics(ctx)
+            )
 
+        # When opted in, reworded iterations of a pitch reuse the nearest earlier analysis;
+        # otherwise the embedding is only stored, so it runs alongside the Gemini requests
+        cache_scope = f"{mode}/{source_type}"
+        embedding_task = asyncio.ensure_future(asyncio.to_thread(self._embed_pitch, pitch_content))
+        if semantic_cache:
+            embedding = await embedding_task
+            if embedding is not None:
+                cached_result = self._response_cache.get_similar(
+                    embedding, cache_scope, config.SEMANTIC_CACHE_THRESHOLD
+                )
+                if cached_result is not None:
+                    return cached_result
+
+        # The text heuristics don't need any model output, so they run on a worker
+        # thread while the Gemini requests are in flight
+        heuristics_task = asyncio.ensure_future(asyncio.to_thread(self._scan_heuristics, ctx))
+
+        # One structured request covers the deck, investor reactions and VC Q&A;
+        # the semaphore bounds each per-section fallback request
+        semaphore = asyncio.Semaphore(config.MAX_CONCURRENCY)
+        cached_pitch = await asyncio.to_thread(self._create_pitch_cache, pitch_content)
+        session = self._open_session(pitch_content, semaphore, cached_pitch)
+        try:
+            deck_summary, investor_simulations, vc_qa_battle = await self._analyze_combined(session)
+        finally:
+            if cached_pitch is not None:
+                await asyncio.to_thread(self._delete_pitch_cache, cached_pitch)
+        
+        result = self._assemble_result(
+            ctx, mode, deck_summary, investor_simulations, vc_qa_battle, await heuristics_task
+        )
+        
+        self._response_cache.put(cache_key, result, await embedding_task, cache_scope)
+        return result
+    
+    def _prepare_pitch(self, pitch_content: str, source_type: str) -> str:
+        """Clean up the pitch text before it is scored or sent to Gemini."""
         # Pre-process content based on source type
         if source_type == "ocr":
             pitch_content = self._post_process_ocr_content(pitch_content)
 
-        # Extract deck elements
-        deck_summary = self._extract_deck_elements(pitch_content)
+        # Byte-identical pitches give byte-identical prompt prefixes on retries
+        return self._canonicalize_pitch(pitch_content)
+    
+    def _gate_reason(self, ctx: _PitchScanContext) -> Optional[str]:
+        """Return why a pitch is too thin to send to Gemini, or None if it should be analyzed."""
+        if len(ctx.raw) < config.MIN_PITCH_CHARS:
+            return f"{len(ctx.raw)} chars < {config.MIN_PITCH_CHARS}"
+        if len(ctx.words) < config.MIN_PITCH_WORDS:
+            return f"{len(ctx.words)} words < {config.MIN_PITCH_WORDS}"
+        return None
+    
+    def _scan_heuristics(self, ctx: _PitchScanContext) -> Tuple[PitchFlag, Dict[str, Any]]:
+        """Run the text-only scorers, which don't depend on any Gemini output."""
+        flags, flag_messages = self._detect_pitch_flags(ctx)
+        return flags, {
+            "storytelling_score": self._calculate_storytelling_score(ctx),
+            "emotional_hook_score": self._calculate_emotional_hook_score(ctx),
+            "hype_meter": self._calculate_hype_meter(ctx),
+            "startup_archetype": self._detect_startup_archetype(ctx),
+            "pitch_flags": flag_messages
+        }
+    
+    def _assemble_result(self, ctx: _PitchScanContext, mode: str, deck_summary: DeckSummary,
+                         investor_simulations: List[InvestorReaction], vc_qa_battle: VCQABattle,
+                         heuristics: Tuple[PitchFlag, Dict[str, Any]]) -> PitchAnalysisResult:
+        """Combine the Gemini outputs and text heuristics with the deck-dependent scorers."""
+        flags, heuristic_fields = heuristics
         
         # Calculate scores
-        readiness_score = self._calculate_readiness_score(deck_summary, pitch_content)
-        storytelling_score = self._calculate_storytelling_score(pitch_content)
-        emotional_hook_score = self._calculate_emotional_hook_score(pitch_content)
-        hype_meter = self._calculate_hype_meter(pitch_content)
-        
-        # Generate investor reactions
-        investor_simulations = self._simulate_investor_reactions(pitch_content, deck_summary)
-        
-        # Generate VC Q&A
-        vc_qa_battle = self._generate_vc_qa_battle(pitch_content, deck_summary)
-        
-        # Detect startup archetype
-        startup_archetype = self._detect_startup_archetype(pitch_content, deck_summary)
-        
-        # Detect pitch flags
-        pitch_flags = self._detect_pitch_flags(pitch_content)
+        readiness_score = self._calculate_readiness_score(deck_summary, ctx.raw)
         
         # Generate crowd feedback
-        crowd_feedback = self._generate_crowd_feedback(pitch_content, mode)
+        crowd_feedback = self._generate_crowd_feedback(ctx.raw, mode)
         
         # Validate idea
-        idea_validation = self._validate_idea(pitch_content, deck_summary)
+        idea_validation = self._validate_idea(ctx, deck_summary)
         
         # Analyze team-product-market fit
         tpm_fit = self._analyze_team_product_market_fit(deck_summary)
         
         # Generate recommendations
         recommendations = self._generate_recommendations(
-            deck_summary, readiness_score, pitch_flags, mode
+            deck_summary, readiness_score, flags, mode
         )
         
         return PitchAnalysisResult(
@@ -69,26 +403,100 @@ class PitchAnalyzer:
             readiness_score=readiness_score,
             investor_simulations=investor_simulations,
             vc_qa_battle=vc_qa_battle,
-            hype_meter=hype_meter,
-            startup_archetype=startup_archetype,
-            pitch_flags=pitch_flags,
             crowd_feedback=crowd_feedback,
             idea_validation_report=idea_validation,
             team_product_market_fit=tpm_fit,
             recommendations=recommendations,
-            storytelling_score=storytelling_score,
-            emotional_hook_score=emotional_hook_score
+            **heuristic_fields
         )
     
-    def _extract_deck_elements(self, pitch_content: str) -> DeckSummary:
-        """Extract key elements from pitch content."""
-        prompt = f"""
-        Analyze this startup pitch and extract the following elements. Rate each element's clarity (0-10) and completeness (0-10):
+    def _embed_pitch(self, pitch_content: str) -> Optional[np.ndarray]:
+        """Embed the pitch for semantic cache lookups, or None if embedding fails."""
+        try:
+            response = genai.embed_content(
+                model=config.EMBEDDING_MODEL,
+                content=pitch_content[:config.EMBEDDING_MAX_CHARS],
+                task_type="semantic_similarity"
+            )
+            return np.asarray(response["embedding"], dtype=np.float32)
+        except Exception:
+            return None
+    
+    def _canonicalize_pitch(self, pitch_content: str) -> str:
+        """Collapse whitespace runs while keeping line structure."""
+        content = _BLANK_RUN_RE.sub(' ', pitch_content)
+        return _LINE_BREAK_RE.sub('\n', content).strip()
+    
+    def _create_pitch_cache(self, pitch_content: str):
+        """Upload the instruction and pitch as a Gemini context cache, or None if not worthwhile."""
+        return create_context_cache([pitch_content], system_instruction=_ANALYST_INSTRUCTION)
+    
+    def _delete_pitch_cache(self, cached_pitch) -> None:
+        """Release a context cache once the analysis no longer needs it."""
+        try:
+            cached_pitch.delete()
+        except Exception:
+            pass  # The TTL will expire it anyway
+    
+    def _open_session(self, pitch_content: str, semaphore: asyncio.Semaphore,
+                      cached_pitch=None) -> _PitchSession:
+        """Build the per-analysis session, sending only task suffixes when the pitch is cached."""
+        if cached_pitch is not None:
+            model = genai.GenerativeModel.from_cached_content(cached_content=cached_pitch)
+            return _PitchSession(model, "", pitch_content, semaphore)
+
+        return _PitchSession(self.model, self._pitch_prefix(pitch_content), pitch_content, semaphore)
+    
+    def _pitch_prefix(self, pitch_content: str) -> str:
+        """Instruction and pitch, sent ahead of every task prompt when the pitch isn't cached."""
+        return f"{_ANALYST_INSTRUCTION}\n\nPitch Content:\n{pitch_content}\n\n"
+    
+    async def _generate(self, session: _PitchSession, task: str, **kwargs):
+        """Send a task prompt to Gemini, bounded by the shared concurrency semaphore."""
+        async with session.semaphore:
+            return await session.model.generate_content_async(session.prefix + task, **kwargs)
+    
+    async def _analyze_combined(self, session: _PitchSession) -> Tuple[DeckSummary, List[InvestorReaction], VCQABattle]:
+        """Request every Gemini-backed section in one structured call, re-requesting only sections that fail."""
+        text = ""
+        try:
+            response = await self._generate(session, self._combined_task(), generation_config={
+                "response_mime_type": "application/json",
+                "response_schema": _COMBINED_ANALYSIS_SCHEMA,
+                "temperature": 0.2
+            })
+            text = response.text
+        except Exception:
+            logger.info("Combined analysis request failed; requesting sections separately")
+
+        deck_summary, investor_simulations, vc_qa_battle = self._parse_combined(text)
+        # The deck and investor fallbacks are independent; Q&A needs the deck, so it goes last
+        if deck_summary is None and investor_simulations is None:
+            deck_summary, investor_simulations = await asyncio.gather(
+                self._extract_deck_elements(session),
+                self._simulate_investor_reactions(session)
+            )
+        elif deck_summary is None:
+            deck_summary = await self._extract_deck_elements(session)
+        elif investor_simulations is None:
+            investor_simulations = await self._simulate_investor_reactions(session)
+        if vc_qa_battle is None:
+            vc_qa_battle = await self._generate_vc_qa_battle(session, deck_summary)
+
+        return deck_summary, investor_simulations, vc_qa_battle
+    
+    def _combined_task(self) -> str:
+        """Task prompt for the combined deck / reactions / Q&A request."""
+        personas = [
+            {"name": p['name'], "style": p['style'], "focus": p['focus']}
+            for p in config.INVESTOR_PERSONAS
+        ]
 
-        Pitch Content:
-        {pitch_content}
+        return f"""
+        Analyze the pitch above and return a single JSON object with three sections.
 
-        Extract and analyze:
+        deck_summary: extract each of the following elements and rate its clarity (0-10) and completeness (0-10).
+        Use "Not clearly defined" as the content of any element the pitch doesn't cover.
         1. Problem - What problem does this solve?
         2. Solution - How does the product/service solve it?
         3. Market - Target market and size
@@ -99,32 +507,114 @@ class PitchAnalyzer:
         8. Competition - Competitive landscape
         9. Vision - Long-term vision and goals
 
-        Return as JSON with this structure:
-        {{
-            "problem": {{"content": "...", "clarity_score": 8.5, "completeness_score": 7.0}},
-            "solution": {{"content": "...", "clarity_score": 9.0, "completeness_score": 8.5}},
-            ...
-        }}
+        investor_reactions: for each of the following investors
+        {json.dumps(personas)}
+        return an object with:
+        - persona: the investor's name exactly as given
+        - reaction: their honest reaction (2-3 sentences)
+        - likelihood: investment likelihood (High/Medium/Low/Very Low)
+        - concerns: their top 3 concerns
+        - excitement: excitement level (0-10)
+        Be authentic to each persona's investment style.
+
+        vc_questions: 3 tough, realistic questions VCs would ask about this pitch, each with
+        an ideal founder response, a difficulty level (Easy/Medium/Hard) and a category
+        (Business Model/Market/Team/Traction/etc.).
+        """
+    
+    def _parse_combined(self, text: str) -> Tuple[Optional[DeckSummary], Optional[List[InvestorReaction]],
+                                                  Optional[VCQABattle]]:
+        """Split a combined response into its sections, with None for any that are missing or invalid."""
+        try:
+            data = json.loads(text)
+        except ValueError:
+            data = None
+        if not isinstance(data, dict):
+            return None, None, None
+
+        try:
+            deck_summary = DeckSummary(**{
+                name: pitch_element_from_dict(element)
+                for name, element in data["deck_summary"].items()
+            })
+        except Exception:
+            deck_summary = None
+
+        items = data.get("investor_reactions")
+        investor_simulations = self._map_persona_reactions(items) if isinstance(items, list) and items else None
+
+        try:
+            vc_qa_battle = VCQABattle(questions=[
+                QAItem(
+                    question=item["question"],
+                    ideal_response=item["ideal_response"],
+                    difficulty_level=item["difficulty_level"],
+                    category=item["category"]
+                )
+                for item in data["vc_questions"][:3]
+            ])
+        except Exception:
+            vc_qa_battle = None
+        if vc_qa_battle is not None and not vc_qa_battle.questions:
+            vc_qa_battle = None
+
+        return deck_summary, investor_simulations, vc_qa_battle
+    
+    async def _extract_deck_elements(self, session: _PitchSession) -> DeckSummary:
+        """Extract key elements from pitch content."""
+        task = """
+        Extract the following elements from the pitch above. Rate each element's clarity (0-10) and completeness (0-10).
+        Use "Not clearly defined" as the content of any element the pitch doesn't cover.
+
+        Extract and analyze:
+        1. Problem - What problem does this solve?
+        2. Solution - How does the product/service solve it?
+        3. Market - Target market and size
+        4. Traction - Current progress, users, revenue
+        5. Business Model - How they make money
+        6. Team - Founders and key team members
+        7. Financials - Revenue projections, funding needs
+        8. Competition - Competitive landscape
+        9. Vision - Long-term vision and goals
         """
         
         try:
-            response = self.model.generate_content(prompt)
-            result = json.loads(response.text.strip())
-            
-            return DeckSummary(
-                problem=PitchElement(**result.get("problem", {"content": "Not clearly defined", "clarity_score": 3.0, "completeness_score": 2.0})),
-                solution=PitchElement(**result.get("solution", {"content": "Not clearly defined", "clarity_score": 3.0, "completeness_score": 2.0})),
-                market=PitchElement(**result.get("market", {"content": "Not clearly defined", "clarity_score": 3.0, "completeness_score": 2.0})),
-                traction=PitchElement(**result.get("traction", {"content": "Not clearly defined", "clarity_score": 3.0, "completeness_score": 2.0})),
-                business_model=PitchElement(**result.get("business_model", {"content": "Not clearly defined", "clarity_score": 3.0, "completeness_score": 2.0})),
-                team=PitchElement(**result.get("team", {"content": "Not clearly defined", "clarity_score": 3.0, "completeness_score": 2.0})),
-                financials=PitchElement(**result.get("financials", {"content": "Not clearly defined", "clarity_score": 3.0, "completeness_score": 2.0})),
-                competition=PitchElement(**result.get("competition", {"content": "Not clearly defined", "clarity_score": 3.0, "completeness_score": 2.0})),
-                vision=PitchElement(**result.get("vision", {"content": "Not clearly defined", "clarity_score": 3.0, "completeness_score": 2.0}))
-            )
-        except Exception as e:
-            # Fallback to basic analysis if JSON parsing fails
-            return self._basic_element_extraction(pitch_content)
+            # The schema guarantees well-formed JSON with every element present
+            async with session.semaphore:
+                response = await session.model.generate_content_async(
+                    session.prefix + task,
+                    stream=True,
+                    generation_config={
+                        "response_mime_type": "application/json",
+                        "response_schema": _DECK_SUMMARY_SCHEMA,
+                        "temperature": 0.2
+                    }
+                )
+                return await self._parse_deck_stream(response)
+        except Exception:
+            # Fallback to basic analysis if the request fails or scores are out of range
+            return self._basic_element_extraction(session.pitch_content)
+    
+    async def _parse_deck_stream(self, response) -> DeckSummary:
+        """Build a DeckSummary from a streamed JSON response, element by element when ijson is available."""
+        if ijson is None:
+            text = "".join([chunk.text async for chunk in response])
+            return decode_deck_summary(text)
+
+        # Each top-level element is validated as soon as its closing brace arrives
+        elements = {}
+        items = ijson.sendable_list()
+        parser = ijson.kvitems_coro(items, '', use_float=True)
+        async for chunk in response:
+            parser.send(chunk.text.encode())
+            for name, element in items:
+                elements[name] = pitch_element_from_dict(element)
+            del items[:]
+        parser.close()
+        for name, element in items:
+            elements[name] = pitch_element_from_dict(element)
+
+        return DeckSummary(**elements)
     
     def _basic_element_extraction(self, pitch_content: str) -> DeckSummary:
         """Fallback method for basic element extraction."""
@@ -145,260 +635,198 @@ class PitchAnalyzer:
     
     def _calculate_readiness_score(self, deck_summary: DeckSummary, pitch_content: str) -> float:
         """Calculate overall pitch readiness score (0-100)."""
-        # Weight different elements
-        weights = {
-            'problem': 0.15,
-            'solution': 0.15,
-            'market': 0.12,
-            'traction': 0.18,
-            'business_model': 0.12,
-            'team': 0.10,
-            'financials': 0.10,
-            'competition': 0.05,
-            'vision': 0.03
-        }
-        
-        total_score = 0
-        for element_name, weight in weights.items():
-            element = getattr(deck_summary, element_name)
-            element_score = (element.clarity_score + element.completeness_score) / 2
-            total_score += element_score * weight * 10  # Scale to 0-100
+        # Weighted average of element scores, scaled to 0-100
+        clarity, completeness = DeckScores(deck_summary).to_float()
+        total_score = float((clarity + completeness) * 0.5 @ _READINESS_WEIGHTS * 10)
         
         return min(100, max(0, total_score))
     
-    def _calculate_storytelling_score(self, pitch_content: str) -> float:
+    def _calculate_storytelling_score(self, ctx: _PitchScanContext) -> float:
         """Calculate storytelling quality score."""
-        # Simple heuristic based on narrative elements
-        story_indicators = [
-            r'\b(story|journey|began|started|founded)\b',
-            r'\b(problem|pain|frustration|challenge)\b',
-            r'\b(solution|answer|solve|fix)\b',
-            r'\b(vision|future|imagine|dream)\b'
-        ]
-        
-        score = 0
-        for pattern in story_indicators:
-            if re.search(pattern, pitch_content, re.IGNORECASE):
-                score += 2.5
+        # Simple heuristic based on narrative elements, one scan for all categories
+        found = set()
+        for match in _STORY_RE.finditer(ctx.lower):
+            found.add(match.lastgroup)
+            if len(found) == _STORY_CATEGORIES:
+                break
         
-        return min(10, score)
+        return min(10, len(found) * 2.5)
     
-    def _calculate_emotional_hook_score(self, pitch_content: str) -> float:
+    def _calculate_emotional_hook_score(self, ctx: _PitchScanContext) -> float:
         """Calculate emotional engagement score."""
-        emotional_words = [
-            r'\b(passionate|excited|love|hate|frustrated|amazing|incredible)\b',
-            r'\b(transform|change|impact|difference|better|improve)\b',
-            r'\b(people|users|customers|lives|world|society)\b'
-        ]
+        matches = dict.fromkeys(_EMOTION_RE.groupindex, 0)
+        for match in _EMOTION_RE.finditer(ctx.lower):
+            matches[match.lastgroup] += 1
         
-        score = 0
-        for pattern in emotional_words:
-            matches = len(re.findall(pattern, pitch_content, re.IGNORECASE))
-            score += min(matches * 0.5, 3.33)  # Cap contribution per category
+        # Cap contribution per category
+        score = sum(min(count * 0.5, 3.33) for count in matches.values())
         
         return min(10, score)
     
-    def _calculate_hype_meter(self, pitch_content: str) -> float:
+    def _calculate_hype_meter(self, ctx: _PitchScanContext) -> float:
         """Calculate hype level (0-100)."""
-        hype_score = 0
-        
-        for term in config.HYPE_TERMS:
-            count = len(re.findall(rf'\b{re.escape(term)}\b', pitch_content, re.IGNORECASE))
-            hype_score += count * 5  # Each hype term adds 5 points
-        
-        # Add points for excessive superlatives
-        superlatives = r'\b(best|greatest|ultimate|revolutionary|groundbreaking|unprecedented)\b'
-        superlative_count = len(re.findall(superlatives, pitch_content, re.IGNORECASE))
-        hype_score += superlative_count * 3
-        
-        return min(100, hype_score)
+        # Each hype term adds 5 points, each superlative 3
+        return min(100, len(_HYPE_RE.findall(ctx.lower)) * 5 + len(_SUPERLATIVE_RE.findall(ctx.lower)) * 3)
 
-    def _simulate_investor_reactions(self, pitch_content: str, deck_summary: DeckSummary) -> List[InvestorReaction]:
+    async def _simulate_investor_reactions(self, session: _PitchSession) -> List[InvestorReaction]:
         """Simulate different investor persona reactions."""
-        reactions = []
+        personas = [
+            {"name": p['name'], "style": p['style'], "focus": p['focus']}
+            for p in config.INVESTOR_PERSONAS
+        ]
 
-        for persona_config in config.INVESTOR_PERSONAS:
-            prompt = f"""
-            You are a {persona_config['name']} with a {persona_config['style']} investment approach.
-            Focus areas: {', '.join(persona_config['focus'])}
+        # One request covers every persona, so the pitch is only sent once
+        task = f"""
+        Analyze the pitch above from the perspective of each of the following investors:
+        {json.dumps(personas)}
 
-            Analyze this pitch and provide your reaction:
-            {pitch_content}
+        For each investor, return an object with:
+        - persona: the investor's name exactly as given
+        - reaction: their honest reaction (2-3 sentences)
+        - likelihood: investment likelihood (High/Medium/Low/Very Low)
+        - concerns: their top 3 concerns
+        - excitement: excitement level (0-10)
 
-            Provide:
-            1. Your honest reaction (2-3 sentences)
-            2. Investment likelihood (High/Medium/Low/Very Low)
-            3. Top 3 concerns
-            4. Excitement level (0-10)
+        Be authentic to each persona's investment style.
+        """
 
-            Be authentic to your persona's investment style.
-            """
+        items = []
+        try:
+            response = await self._generate(session, task, generation_config={
+                "response_mime_type": "application/json",
+                "response_schema": list[_PersonaReactionSchema]
+            })
+            items = json.loads(response.text)
+        except Exception:
+            pass
 
+        return self._map_persona_reactions(items)
+
+    def _map_persona_reactions(self, items: List[Dict[str, Any]]) -> List[InvestorReaction]:
+        """Match response objects to the configured personas, falling back for any that are missing."""
+        parsed = {}
+        for item in items:
+            if isinstance(item, dict):
+                parsed[item.get("persona")] = item
+
+        reactions = []
+        for persona_config in config.INVESTOR_PERSONAS:
+            item = parsed.get(persona_config['name'])
             try:
-                response = self.model.generate_content(prompt)
-                reaction_text = response.text.strip()
-
-                # Parse response (simplified - in production, use structured prompts)
-                likelihood = InvestmentLikelihood.MEDIUM  # Default
-                if "high" in reaction_text.lower():
-                    likelihood = InvestmentLikelihood.HIGH
-                elif "low" in reaction_text.lower():
-                    likelihood = InvestmentLikelihood.LOW
-                elif "very low" in reaction_text.lower():
-                    likelihood = InvestmentLikelihood.VERY_LOW
-
-                reactions.append(InvestorReaction(
-                    persona=persona_config['name'],
-                    avatar=persona_config['avatar'],
-                    reaction=reaction_text[:200] + "..." if len(reaction_text) > 200 else reaction_text,
-                    investment_likelihood=likelihood,
-                    key_concerns=["Market validation", "Scalability", "Competition"],  # Simplified
-                    excitement_level=7.0  # Default
-                ))
+                reactions.append(self._build_persona_reaction(persona_config, item))
             except Exception:
-                # Fallback reaction
-                reactions.append(InvestorReaction(
-                    persona=persona_config['name'],
-                    avatar=persona_config['avatar'],
-                    reaction="Interesting concept, but need more details to make an informed decision.",
-                    investment_likelihood=InvestmentLikelihood.MEDIUM,
-                    key_concerns=["Need more information"],
-                    excitement_level=5.0
-                ))
+                reactions.append(self._get_fallback_reaction(persona_config))
 
         return reactions
 
-    def _generate_vc_qa_battle(self, pitch_content: str, deck_summary: DeckSummary) -> VCQABattle:
-        """Generate tough VC questions and ideal responses."""
-        prompt = f"""
-        Based on this pitch, generate 3 tough investor questions that VCs would ask:
-
-        {pitch_content}
+    def _build_persona_reaction(self, persona_config: Dict[str, Any],
+                                item: Optional[Dict[str, Any]]) -> InvestorReaction:
+        """Map one element of the batched reactions response onto an InvestorReaction."""
+        if not item:
+            return self._get_fallback_reaction(persona_config)
 
-        For each question, provide:
-        1. The tough question
-        2. An ideal founder response
-        3. Difficulty level (Easy/Medium/Hard)
-        4. Category (Business Model/Market/Team/Traction/etc.)
+        reaction_text = str(item.get("reaction", "")).strip()
+        likelihood = _LIKELIHOOD_LEVELS.get(
+            str(item.get("likelihood", "")).strip().lower(), InvestmentLikelihood.MEDIUM
+        )
+        concerns = [str(c).strip() for c in item.get("concerns", []) if str(c).strip()]
+
+        return InvestorReaction(
+            persona=persona_config['name'],
+            avatar=persona_config['avatar'],
+            reaction=reaction_text[:200] + "..." if len(reaction_text) > 200 else reaction_text,
+            investment_likelihood=likelihood,
+            key_concerns=concerns[:3] or ["Need more information"],
+            excitement_level=max(0.0, min(10.0, float(item.get("excitement", 5.0))))
+        )
 
-        Make questions realistic and challenging.
-        """
+    def _get_fallback_reaction(self, persona_config: Dict[str, Any]) -> InvestorReaction:
+        """Fallback reaction when a persona is missing from the response."""
+        return InvestorReaction(
+            persona=persona_config['name'],
+            avatar=persona_config['avatar'],
+            reaction="Interesting concept, but need more details to make an informed decision.",
+            investment_likelihood=InvestmentLikelihood.MEDIUM,
+            key_concerns=["Need more information"],
+            excitement_level=5.0
+        )
 
+    async def _generate_vc_qa_battle(self, session: _PitchSession, deck_summary: DeckSummary) -> VCQABattle:
+        """Generate tough VC questions for the deck's weak areas when the combined response had none."""
         try:
-            response = self.model.generate_content(prompt)
-            # Simplified parsing - in production, use structured JSON responses
-            questions = [
-                QAItem(
-                    question="How do you plan to scale without burning cash in a competitive market?",
-                    ideal_response="We've identified a clear path to profitability through our enterprise-first strategy, focusing on high-LTV customers while maintaining lean operations.",
-                    difficulty_level="Hard",
-                    category="Business Model"
-                ),
-                QAItem(
-                    question="What's your defensibility beyond being first to market?",
-                    ideal_response="Our IP portfolio, exclusive partnerships, and network effects create strong barriers to entry that compound over time.",
-                    difficulty_level="Medium",
-                    category="Competition"
-                ),
-                QAItem(
-                    question="How will you acquire customers cost-effectively?",
-                    ideal_response="Our viral coefficient of 1.3 and organic growth channels reduce CAC by 60% compared to traditional acquisition methods.",
-                    difficulty_level="Medium",
-                    category="Traction"
-                )
-            ]
-
-            return VCQABattle(questions=questions)
+            return await VCQABattleGenerator().generate_qa_battle_async(
+                session.pitch_content, deck_summary, session.semaphore
+            )
         except Exception:
-            # Fallback questions
-            return VCQABattle(questions=[
-                QAItem(
-                    question="What's your go-to-market strategy?",
-                    ideal_response="We have a multi-channel approach focusing on direct sales and strategic partnerships.",
-                    difficulty_level="Medium",
-                    category="Business Model"
-                )
-            ])
+            return self._get_fallback_qa_battle()
+
+    def _get_fallback_qa_battle(self) -> VCQABattle:
+        """Fallback questions when Gemini isn't consulted or fails."""
+        return VCQABattle(questions=[
+            QAItem(
+                question="What's your go-to-market strategy?",
+                ideal_response="We have a multi-channel approach focusing on direct sales and strategic partnerships.",
+                difficulty_level="Medium",
+                category="Business Model"
+            )
+        ])
 
-    def _detect_startup_archetype(self, pitch_content: str, deck_summary: DeckSummary) -> str:
+    def _detect_startup_archetype(self, ctx: _PitchScanContext) -> str:
         """Detect startup archetype based on content analysis."""
         # Simple keyword-based detection
-        content_lower = pitch_content.lower()
-
-        archetype_indicators = {
-            "Builder": ["product", "technology", "engineering", "development", "build"],
-            "Visionary": ["future", "vision", "transform", "revolution", "change the world"],
-            "Hustler": ["sales", "growth", "customers", "revenue", "market"],
-            "Academic": ["research", "study", "analysis", "data", "scientific"],
-            "Disruptor": ["disrupt", "traditional", "outdated", "new way", "challenge"],
-            "Optimizer": ["efficiency", "optimize", "improve", "better", "streamline"],
-            "Connector": ["network", "platform", "connect", "community", "social"],
-            "Researcher": ["insights", "discovery", "findings", "investigation", "explore"]
-        }
-
-        scores = {}
-        for archetype, keywords in archetype_indicators.items():
-            score = sum(content_lower.count(keyword) for keyword in keywords)
-            scores[archetype] = score
+        scores = dict.fromkeys(_ARCHETYPE_INDICATORS, 0)
+        for archetype, _ in _ARCHETYPE_SCANNER.iter(ctx.lower):
+            scores[archetype] += 1
 
         return max(scores, key=scores.get) if scores else "Builder"
 
-    def _detect_pitch_flags(self, pitch_content: str) -> List[str]:
-        """Detect potential red flags in the pitch."""
-        flags = []
-        content_lower = pitch_content.lower()
+    def _detect_pitch_flags(self, ctx: _PitchScanContext) -> Tuple[PitchFlag, List[str]]:
+        """Detect potential red flags in the pitch, as flags plus human-readable messages."""
+        flags = PitchFlag.NONE
+        messages = []
+
+        # Distinct terms present, per group, from a single scan
+        found = set(_FLAG_SCANNER.iter(ctx.lower))
+        counts = dict.fromkeys(_FLAG_TERMS, 0)
+        for group, _ in found:
+            counts[group] += 1
 
         # Check for hype terms
-        hype_count = sum(1 for term in config.HYPE_TERMS
-                        if term.lower() in content_lower)
+        hype_count = counts["hype"]
         if hype_count > 3:
-            flags.append(f"Overuse of hype terms ({hype_count} detected)")
+            flags |= PitchFlag.HYPE
+            messages.append(f"Overuse of hype terms ({hype_count} detected)")
 
         # Check for vague language
-        vague_terms = ["synergy", "leverage", "optimize", "streamline", "innovative"]
-        vague_count = sum(1 for term in vague_terms if term in content_lower)
-        if vague_count > 2:
-            flags.append("Uses vague business jargon")
+        if counts["vague"] > 2:
+            flags |= PitchFlag.VAGUE
+            messages.append("Uses vague business jargon")
 
         # Check for missing key elements
-        if "revenue" not in content_lower and "monetization" not in content_lower:
-            flags.append("Unclear monetization model")
+        if not counts["monetization"]:
+            flags |= PitchFlag.NO_MONETIZATION
+            messages.append("Unclear monetization model")
 
-        if "customer" not in content_lower and "user" not in content_lower:
-            flags.append("Target customer not clearly defined")
+        if not counts["customer"]:
+            flags |= PitchFlag.NO_CUSTOMER
+            messages.append("Target customer not clearly defined")
 
-        return flags
+        return flags, messages
 
     def _generate_crowd_feedback(self, pitch_content: str, mode: str) -> List[CrowdFeedback]:
         """Generate AI crowd feedback comments."""
-        feedback_templates = [
-            {"comment": "🔥 This pitch just woke up my inner founder. Let's go!", "sentiment": "positive", "emoji": "🔥", "category": "motivation"},
-            {"comment": "A bit too much fluff, bro. Where's the MVP?", "sentiment": "negative", "emoji": "🤔", "category": "technical"},
-            {"comment": "Great idea, but needs a co-founder with tech chops.", "sentiment": "neutral", "emoji": "💡", "category": "team"},
-            {"comment": "Reminds me of Figma's early deck. Huge potential.", "sentiment": "positive", "emoji": "🚀", "category": "comparison"},
-            {"comment": "Market sizing assumptions seem optimistic. Show me the data.", "sentiment": "negative", "emoji": "📊", "category": "business"}
-        ]
-
-        # In expert mode, add more technical feedback
-        if mode == "expert":
-            feedback_templates.extend([
-                {"comment": "Unit economics don't add up. CAC > LTV is concerning.", "sentiment": "negative", "emoji": "💰", "category": "financials"},
-                {"comment": "Competitive moat isn't defensible long-term.", "sentiment": "negative", "emoji": "🏰", "category": "strategy"}
-            ])
+        pool = _EXPERT_FEEDBACK if mode == "expert" else _BASE_FEEDBACK
 
         # Select random subset
-        import random
-        selected = random.sample(feedback_templates, min(5, len(feedback_templates)))
-
-        return [CrowdFeedback(**item) for item in selected]
+        return random.sample(pool, min(5, len(pool)))
 
-    def _validate_idea(self, pitch_content: str, deck_summary: DeckSummary) -> IdeaValidationReport:
+    def _validate_idea(self, ctx: _PitchScanContext, deck_summary: DeckSummary) -> IdeaValidationReport:
         """Validate the startup idea logic."""
         issues = []
 
         # Check market size claims
-        if "billion" in pitch_content.lower() and "market" in pitch_content.lower():
-            if "source" not in pitch_content.lower() and "research" not in pitch_content.lower():
+        if "billion" in ctx.lower and "market" in ctx.lower:
+            if "source" not in ctx.lower and "research" not in ctx.lower:
                 issues.append("Market sizing claims lack credible sources")
 
         # Check problem-solution fit
@@ -451,7 +879,7 @@ class PitchAnalyzer:
         )
 
     def _generate_recommendations(self, deck_summary: DeckSummary, readiness_score: float,
-                                pitch_flags: List[str], mode: str) -> Dict[str, List[str]]:
+                                flags: PitchFlag, mode: str) -> Dict[str, List[str]]:
         """Generate improvement recommendations."""
         recommendations = {"next_steps": []}
 
@@ -475,10 +903,10 @@ class PitchAnalyzer:
             recommendations["next_steps"].append("Conduct thorough competitive analysis")
 
         # Flag-based recommendations
-        if "hype terms" in str(pitch_flags):
+        if PitchFlag.HYPE in flags:
             recommendations["next_steps"].append("Replace buzzwords with concrete, specific language")
 
-        if "monetization" in str(pitch_flags):
+        if PitchFlag.NO_MONETIZATION in flags:
             recommendations["next_steps"].append("Clearly define revenue streams and pricing strategy")
 
         # Mode-specific recommendations
@@ -493,28 +921,13 @@ class PitchAnalyzer:
 
     def _post_process_ocr_content(self, ocr_content: str) -> str:
         """Post-process OCR extracted content for better analysis."""
-        import re
-
         # Clean up common OCR errors
         content = ocr_content
 
-        # Fix common OCR character substitutions
-        ocr_fixes = {
-            r'\b0\b': 'O',  # Zero to O
-            r'\b1\b': 'I',  # One to I (in context)
-            r'\b5\b': 'S',  # Five to S (in context)
-            r'\b8\b': 'B',  # Eight to B (in context)
-            r'rn': 'm',     # Common OCR error
-            r'cl': 'd',     # Common OCR error
-            r'vv': 'w',     # Common OCR error
-        }
-
-        for pattern, replacement in ocr_fixes.items():
-            content = re.sub(pattern, replacement, content, flags=re.IGNORECASE)
+        content = _OCR_RE.sub(lambda m: _OCR_MAP[m.group(0).lower()], content)
 
         # Remove excessive whitespace and line breaks
-        content = re.sub(r'\n\s*\n', '\n\n', content)  # Multiple newlines to double
-        content = re.sub(r' +', ' ', content)  # Multiple spaces to single
+        content = _OCR_WS_RE.sub(lambda m: '\n\n' if m.group(0)[0] == '\n' else ' ', content)
 
         # Try to identify and structure slide content
         content = self._structure_slide_content(content)
@@ -523,41 +936,5 @@ class PitchAnalyzer:
 
     def _structure_slide_content(self, content: str) -> str:
         """Attempt to structure slide content into logical sections."""
-        lines = content.split('\n')
-        structured_lines = []
-
-        # Common slide section headers
-        section_patterns = [
-            r'problem',
-            r'solution',
-            r'market',
-            r'traction',
-            r'business model',
-            r'team',
-            r'financials?',
-            r'competition',
-            r'vision',
-            r'ask',
-            r'funding',
-            r'revenue',
-            r'customers?',
-            r'growth'
-        ]
-
-        for line in lines:
-            line = line.strip()
-            if not line:
-                continue
-
-            # Check if line looks like a section header
-            is_header = False
-            for pattern in section_patterns:
-                if re.search(pattern, line, re.IGNORECASE) and len(line.split()) <= 3:
-                    structured_lines.append(f"\n{line.upper()}:")
-                    is_header = True
-                    break
-
-            if not is_header:
-                structured_lines.append(line)
-
-        return '\n'.join(structured_lines)
+        content = _LINE_TRIM_RE.sub('\n', content).strip()
+        return _SECTION_RE.sub(lambda m: f"\n{m.group(0).upper()}:", content)
@@ -0,0 +1,185 @@
+"""Response cache for completed pitch analyses."""
+
+import hashlib
+import logging
+import re
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+from src.config import config
+from src.models import PitchAnalysisResult
+
+_WS_RE = re.compile(r'\s+')
+
+logger = logging.getLogger(__name__)
+
+class ResponseCache:
+    """Two-level cache of PitchAnalysisResult: in-process LRU backed by SQLite.
+
+    Entries may also carry a pitch embedding so near-duplicate pitches can be
+    matched by cosine similarity.
+    """
+
+    def __init__(self, path: Optional[str] = None, max_size: Optional[int] = None,
+                 ttl_seconds: Optional[int] = None):
+        """Open (or create) the on-disk store."""
+        self.max_size = max_size or config.RESPONSE_CACHE_SIZE
+        self.ttl_seconds = ttl_seconds or config.RESPONSE_CACHE_TTL_SECONDS
+        self._memory: "OrderedDict[str, PitchAnalysisResult]" = OrderedDict()
+        self._lock = threading.Lock()
+        # scope -> (keys, unit-norm embedding matrix); scope is "mode/source_type"
+        self._vectors: Dict[str, Tuple[List[str], np.ndarray]] = {}
+        # Similarity lookup counters; the hit rate climbs as the index warms up
+        self.similar_lookups = 0
+        self.similar_hits = 0
+
+        try:
+            self._db = sqlite3.connect(path or config.RESPONSE_CACHE_PATH, check_same_thread=False)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS responses (key TEXT PRIMARY KEY, blob BLOB, ts INTEGER)"
+            )
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS embeddings (key TEXT PRIMARY KEY, scope TEXT, vec BLOB)"
+            )
+            self._db.commit()
+            self._load_embeddings()
+        except sqlite3.Error:
+            self._db = None  # Memory-only if the disk store is unavailable
+
+    @staticmethod
+    def make_key(pitch_content: str, mode: str, source_type: str) -> str:
+        """Hash the normalized request so cosmetic edits still hit."""
+        normalized = _WS_RE.sub(' ', pitch_content).strip().lower()
+        return hashlib.sha256(f"{normalized}\x1f{mode}\x1f{source_type}".encode()).hexdigest()
+
+    def get(self, key: str) -> Optional[PitchAnalysisResult]:
+        """Return the cached result for key, or None."""
+        with self._lock:
+            if key in self._memory:
+                self._memory.move_to_end(key)
+                return self._memory[key]
+
+            if self._db is None:
+                return None
+
+            row = self._db.execute(
+                "SELECT blob FROM responses WHERE key = ? AND ts >= ?",
+                (key, int(time.time()) - self.ttl_seconds)
+            ).fetchone()
+
+        if row is None:
+            return None
+
+        try:
+            result = PitchAnalysisResult.model_validate_json(row[0])
+        except ValueError:
+            return None  # Written by an incompatible schema version
+
+        self._remember(key, result)
+        return result
+
+    def get_similar(self, embedding: np.ndarray, scope: str,
+                    threshold: float) -> Optional[PitchAnalysisResult]:
+        """Return the result of the nearest cached pitch in scope if cosine >= threshold."""
+        result = self._nearest(embedding, scope, threshold)
+        
+        with self._lock:
+            self.similar_lookups += 1
+            self.similar_hits += result is not None
+            hits, lookups = self.similar_hits, self.similar_lookups
+        logger.info("Semantic cache %s; hit rate %.1f%% over %d lookups",
+                    "hit" if result is not None else "miss", 100.0 * hits / lookups, lookups)
+        return result
+
+    def _nearest(self, embedding: np.ndarray, scope: str,
+                 threshold: float) -> Optional[PitchAnalysisResult]:
+        """Brute-force cosine search; the index is capped at max_size rows per scope."""
+        with self._lock:
+            keys, matrix = self._vectors.get(scope, ([], None))
+            if not keys:
+                return None
+
+        vec = self._unit(embedding)
+        if matrix.shape[1] != vec.shape[0]:
+            return None  # Indexed with a different embedding model
+        sims = matrix @ vec
+        best = int(np.argmax(sims))
+        if sims[best] < threshold:
+            return None
+        return self.get(keys[best])
+
+    def put(self, key: str, result: PitchAnalysisResult,
+            embedding: Optional[np.ndarray] = None, scope: str = "") -> None:
+        """Store result under key in both levels, indexing embedding for similarity lookups."""
+        self._remember(key, result)
+
+        vec = None
+        if embedding is not None:
+            vec = self._unit(embedding)
+            self._index(key, scope, vec)
+
+        if self._db is None:
+            return
+
+        with self._lock:
+            try:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO responses (key, blob, ts) VALUES (?, ?, ?)",
+                    (key, result.model_dump_json(), int(time.time()))
+                )
+                if vec is not None:
+                    self._db.execute(
+                        "INSERT OR REPLACE INTO embeddings (key, scope, vec) VALUES (?, ?, ?)",
+                        (key, scope, vec.tobytes())
+                    )
+                self._db.execute(
+                    "DELETE FROM responses WHERE ts < ?", (int(time.time()) - self.ttl_seconds,)
+                )
+                self._db.execute(
+                    "DELETE FROM embeddings WHERE key NOT IN (SELECT key FROM responses)"
+                )
+                self._db.commit()
+            except sqlite3.Error:
+                pass
+
+    def _load_embeddings(self) -> None:
+        """Rebuild the similarity index from unexpired rows on disk."""
+        rows = self._db.execute(
+            "SELECT e.key, e.scope, e.vec FROM embeddings e JOIN responses r ON r.key = e.key "
+            "WHERE r.ts >= ? ORDER BY r.ts",
+            (int(time.time()) - self.ttl_seconds,)
+        ).fetchall()
+        for key, scope, blob in rows[-self.max_size:]:
+            self._index(key, scope, np.frombuffer(blob, dtype=np.float32))
+
+    def _index(self, key: str, scope: str, vec: np.ndarray) -> None:
+        """Add a unit vector to its scope's matrix, keeping at most max_size rows."""
+        with self._lock:
+            keys, matrix = self._vectors.get(scope, ([], None))
+            if matrix is None or matrix.shape[1] != vec.shape[0]:
+                keys, matrix = [], np.empty((0, vec.shape[0]), dtype=np.float32)
+            if key in keys:
+                idx = keys.index(key)
+                keys = keys[:idx] + keys[idx + 1:]
+                matrix = np.delete(matrix, idx, axis=0)
+            keys = (keys + [key])[-self.max_size:]
+            matrix = np.vstack([matrix, vec])[-self.max_size:]
+            self._vectors[scope] = (keys, matrix)
+
+    @staticmethod
+    def _unit(embedding: np.ndarray) -> np.ndarray:
+        """Normalize to unit length so a dot product is the cosine similarity."""
+        vec = np.asarray(embedding, dtype=np.float32).ravel()
+        norm = float(np.linalg.norm(vec))
+        return vec / norm if norm else vec
+
+    def _remember(self, key: str, result: PitchAnalysisResult) -> None:
+        """Insert into the in-process LRU, evicting the oldest entries."""
+        with self._lock:
+            self._memory[key] = result
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.max_size:
+                self._memory.popitem(last=False)
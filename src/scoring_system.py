@@ -3,8 +3,22 @@
 import re
 import math
 from typing import List, Dict, Any, Tuple
+import numpy as np
 from src.config import config
-from src.models import DeckSummary, IdeaValidationReport, TeamProductMarketFit
+from src.models import DeckScores, DeckSummary, IdeaValidationReport, TeamProductMarketFit
+
+# Element weights based on VC importance, in DECK_ELEMENTS order
+_READINESS_WEIGHTS = np.array([
+    0.15,  # problem - clear problem definition
+    0.15,  # solution - solution clarity
+    0.12,  # market - market opportunity
+    0.20,  # traction - most important, proof of execution
+    0.12,  # business_model - revenue model
+    0.10,  # team - team capability
+    0.10,  # financials - financial projections
+    0.04,  # competition - competitive analysis
+    0.02   # vision - long-term vision
+], dtype=np.float32)
 
 class PitchScoringSystem:
     """Comprehensive scoring system for startup pitches."""
@@ -16,26 +30,9 @@ class PitchScoringSystem:
     def calculate_readiness_score(self, deck_summary: DeckSummary, pitch_content: str) -> float:
         """Calculate overall pitch readiness score (0-100)."""
         
-        # Element weights based on VC importance
-        weights = {
-            'problem': 0.15,      # Clear problem definition
-            'solution': 0.15,     # Solution clarity
-            'market': 0.12,       # Market opportunity
-            'traction': 0.20,     # Most important - proof of execution
-            'business_model': 0.12, # Revenue model
-            'team': 0.10,         # Team capability
-            'financials': 0.10,   # Financial projections
-            'competition': 0.04,  # Competitive analysis
-            'vision': 0.02        # Long-term vision
-        }
-        
-        total_score = 0
-        
-        for element_name, weight in weights.items():
-            element = getattr(deck_summary, element_name)
-            # Combine clarity and completeness scores
-            element_score = (element.clarity_score + element.completeness_score) / 2
-            total_score += element_score * weight * 10  # Scale to 0-100
+        # Combine clarity and completeness scores, scaled to 0-100
+        clarity, completeness = DeckScores(deck_summary).to_float()
+        total_score = float((clarity + completeness) * 0.5 @ _READINESS_WEIGHTS * 10)
         
         # Apply bonuses and penalties
         bonus_score = self._calculate_bonus_score(pitch_content)
@@ -6,7 +6,7 @@ import plotly.express as px
 from typing import List, Dict, Any
 from src.models import (
     PitchAnalysisResult, InvestorReaction, QAItem, CrowdFeedback,
-    InvestmentLikelihood, TeamProductMarketFit
+    CrowdFeedbackBatch, InvestmentLikelihood, TeamProductMarketFit
 )
 from src.config import config
 
@@ -110,8 +110,6 @@ class PitchOSUI:
     def render_input_section(self) -> str:
         """Render pitch input section with OCR support."""
         from src.file_processor import FileProcessor
-        from src.ocr_processor import HybridOCRProcessor
-        from PIL import Image
 
         st.markdown("## 📝 Submit Your Pitch")
 
@@ -574,6 +572,10 @@ class PitchOSUI:
         st.markdown("## 💬 AI Crowd Feedback")
         st.markdown("*What the startup community might say about your pitch*")
 
+        sentiment_counts = CrowdFeedbackBatch(crowd_feedback).sentiment_counts()
+        st.caption(" · ".join(f"{sentiment.title()}: {count}"
+                              for sentiment, count in sentiment_counts.items()))
+
         for feedback in crowd_feedback:
             sentiment_color = {
                 "positive": "#4ECDC4",
@@ -1,208 +1,374 @@
 """VC Q&A Battle system for PitchOS."""
 
-from typing import List, Dict, Any
+import asyncio
+import hashlib
+import json
+import random
+import threading
+import time
+from collections import OrderedDict
+from operator import itemgetter
+from typing import List, Dict, Any, AsyncIterator, Optional, Set, Tuple, TypedDict
 import google.generativeai as genai
 from src.config import config
+from src.gemini_client import create_context_cache, get_model, run_async
 from src.models import VCQABattle, QAItem, DeckSummary
 
+try:
+    import diskcache
+except ImportError:
+    diskcache = None
+
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
+# Deck elements probed for weak areas, in tie-break order
+_DECK_ELEMENTS = ("traction", "business_model", "competition", "financials", "market", "team")
+
+class _QAItemSchema(TypedDict):
+    """Structured-output schema for one weak area in the batched questions prompt."""
+    area: str
+    question: str
+    ideal_response: str
+    difficulty_level: str
+    category: str
+
+# Context caches of recently seen pitches, keyed by SHA-256: (cached content, expiry time)
+_PITCH_CACHES: Dict[str, Tuple[Any, float]] = {}
+_PITCH_CACHES_LOCK = threading.Lock()
+
+# Gemini response text memoized per (pitch, prompt, model); Streamlit reruns repeat prompts verbatim
+_RESPONSES: "OrderedDict[str, str]" = OrderedDict()
+_RESPONSES_LOCK = threading.Lock()
+_RESPONSES_DISK = None
+
+def _response_key(pitch_digest: str, prompt: str) -> str:
+    """Key a prompt by the pitch it refers to and the model answering it."""
+    digest = hashlib.blake2b(prompt.encode(), digest_size=16)
+    digest.update(pitch_digest.encode())
+    digest.update(config.MODEL_NAME.encode())
+    return digest.hexdigest()
+
+def _disk_responses():
+    """Open the on-disk response cache on first use, or None if diskcache isn't installed."""
+    global _RESPONSES_DISK
+    if diskcache is not None and _RESPONSES_DISK is None:
+        try:
+            _RESPONSES_DISK = diskcache.Cache(config.QA_DISK_CACHE_DIR)
+        except Exception:
+            return None
+    return _RESPONSES_DISK
+
+def _get_cached_response(key: str) -> Optional[str]:
+    """Look a response up in memory, then on disk."""
+    with _RESPONSES_LOCK:
+        if key in _RESPONSES:
+            _RESPONSES.move_to_end(key)
+            return _RESPONSES[key]
+    
+    disk = _disk_responses()
+    text = disk.get(key) if disk is not None else None
+    if text is not None:
+        _store_response(key, text, persist=False)
+    return text
+
+def _store_response(key: str, text: str, persist: bool = True) -> None:
+    """Remember a response in memory and, when available, on disk for 24h."""
+    with _RESPONSES_LOCK:
+        _RESPONSES[key] = text
+        _RESPONSES.move_to_end(key)
+        while len(_RESPONSES) > config.QA_RESPONSE_CACHE_SIZE:
+            _RESPONSES.popitem(last=False)
+    
+    disk = _disk_responses() if persist else None
+    if disk is not None:
+        disk.set(key, text, expire=config.QA_RESPONSE_CACHE_TTL_SECONDS)
+
 class VCQABattleGenerator:
     """Generates tough VC questions and ideal founder responses."""
     
+    # Per-area focus for the weak-area questions prompt
+    _AREA_PROMPTS = {
+        "traction": """
+        Generate a tough VC question about traction and user validation.
+        Focus on metrics, growth rates, user retention, and proof of product-market fit.
+        """,
+        "business_model": """
+        Generate a tough VC question about the business model and monetization.
+        Focus on unit economics, revenue streams, pricing strategy, and scalability.
+        """,
+        "competition": """
+        Generate a tough VC question about competitive landscape and differentiation.
+        Focus on competitive advantages, market positioning, and defensibility.
+        """,
+        "financials": """
+        Generate a tough VC question about financial projections and funding.
+        Focus on burn rate, runway, revenue assumptions, and path to profitability.
+        """,
+        "market": """
+        Generate a tough VC question about market size and opportunity.
+        Focus on TAM/SAM/SOM, market validation, and go-to-market strategy.
+        """,
+        "team": """
+        Generate a tough VC question about the founding team and execution capability.
+        Focus on relevant experience, skill gaps, and ability to scale.
+        """
+    }
+    _DEFAULT_AREA_PROMPT = "Generate a tough VC question about this startup."
+    
+    # Prompt templates for the batched weak-area questions request, filled with format_map
+    _AREA_SECTION_TMPL = """
+        AREA: {area}
+        {area_prompt}
+        SPECIFIC AREA CONTENT:
+        {area_content}
+        """
+    _QUESTIONS_TMPL = """
+        Generate one question for each of the following weak areas of the pitch:
+        {sections}
+        
+        For each area, return an object with:
+        - area: the area exactly as given after AREA
+        - question: a specific, challenging question that a VC would ask
+        - ideal_response: an ideal founder response that addresses the concern
+        - difficulty_level: Easy/Medium/Hard
+        - category: category name
+        
+        Make the questions realistic and the responses demonstrate deep thinking.
+        """
+    
+    # Canned questions for areas whose generation failed
+    _FALLBACK_QUESTIONS = {
+        "traction": QAItem(
+            question="What metrics prove you have product-market fit?",
+            ideal_response="Our key metrics show strong PMF: 40% month-over-month growth, 85% user retention, and NPS of 72.",
+            difficulty_level="Medium",
+            category="Traction"
+        ),
+        "business_model": QAItem(
+            question="How do your unit economics work at scale?",
+            ideal_response="Our LTV:CAC ratio is 4:1 with a 14-month payback period, improving as we scale due to operational leverage.",
+            difficulty_level="Hard",
+            category="Business Model"
+        ),
+        "competition": QAItem(
+            question="What's your sustainable competitive advantage?",
+            ideal_response="Our network effects and proprietary data create increasing returns to scale that competitors can't easily replicate.",
+            difficulty_level="Medium",
+            category="Competition"
+        )
+    }
+    
+    # General questions used when there are fewer than 3 weak areas; QAItem is frozen, so they are shared
+    _GENERAL_QUESTIONS = (
+        QAItem(
+            question="What's your biggest assumption that could kill this business if it's wrong?",
+            ideal_response="Our biggest assumption is that enterprises will pay premium prices for our solution. We're mitigating this risk through pilot programs with 5 Fortune 500 companies, and early feedback validates our pricing model.",
+            difficulty_level="Hard",
+            category="Risk Assessment"
+        ),
+        QAItem(
+            question="How do you plan to defend against Google or Amazon entering this space?",
+            ideal_response="While big tech could build similar features, our advantage lies in our specialized focus and deep customer relationships. We're building network effects and data moats that become stronger over time.",
+            difficulty_level="Hard",
+            category="Competition"
+        ),
+        QAItem(
+            question="What happens if your key technical co-founder leaves tomorrow?",
+            ideal_response="We've built redundancy into our technical leadership with documented processes and cross-training. Our CTO has also helped us build a strong engineering culture that can continue executing our roadmap.",
+            difficulty_level="Medium",
+            category="Team Risk"
+        )
+    )
+    
     def __init__(self):
         """Initialize the Q&A generator with Gemini AI."""
         if not config.GOOGLE_API_KEY:
             raise ValueError("Google API key not found.")
         
-        genai.configure(api_key=config.GOOGLE_API_KEY)
-        self.model = genai.GenerativeModel(config.MODEL_NAME)
+        self.model = get_model(config.MODEL_NAME)
     
     def generate_qa_battle(self, pitch_content: str, deck_summary: DeckSummary) -> VCQABattle:
         """Generate a complete VC Q&A battle session."""
+        return run_async(self.generate_qa_battle_async(pitch_content, deck_summary))
+    
+    async def generate_qa_battle_async(self, pitch_content: str, deck_summary: DeckSummary,
+                                       semaphore: Optional[asyncio.Semaphore] = None) -> VCQABattle:
+        """Generate a complete VC Q&A battle session, covering the weak areas in one request."""
+        # A deck with no element below 7.0 gets the general questions without any Gemini call
+        if not self._identify_weak_areas(deck_summary):
+            return VCQABattle(questions=self._generate_general_tough_questions(3))
         
-        # Identify weak points in the pitch
-        weak_areas = self._identify_weak_areas(deck_summary)
-        
-        # Generate targeted questions
-        questions = []
+        questions = [
+            question async for question in self.stream_qa_battle_async(pitch_content, deck_summary, semaphore)
+        ]
+        return VCQABattle(questions=questions[:3])  # Limit to 3 questions
+    
+    async def stream_qa_battle_async(self, pitch_content: str, deck_summary: DeckSummary,
+                                     semaphore: Optional[asyncio.Semaphore] = None) -> AsyncIterator[QAItem]:
+        """Yield the weak-area questions as each one streams in, then any general questions needed.
+
+        A caller's semaphore, if given, is held only for the Gemini request itself.
+        """
         
-        # Generate questions for each weak area
-        for area in weak_areas[:3]:  # Limit to top 3 weak areas
-            question = self._generate_question_for_area(area, pitch_content, deck_summary)
-            if question:
-                questions.append(question)
+        # Identify weak points in the pitch
+        weak_areas = self._identify_weak_areas(deck_summary)[:3]  # Limit to top 3 weak areas
         
-        # Add general tough questions if we need more
-        while len(questions) < 3:
-            general_question = self._generate_general_tough_question(pitch_content)
-            if general_question:
-                questions.append(general_question)
+        # The questions prompt embeds the pitch, so it is sent (or cached) once as a prefix
+        count = 0
+        if weak_areas:
+            model, prefix = await asyncio.to_thread(self._pitch_model, pitch_content)
+            pitch_digest = hashlib.blake2b(pitch_content.encode(), digest_size=16).hexdigest()
+            async for question in self._stream_questions_for_areas(
+                weak_areas, deck_summary, model, prefix, pitch_digest, semaphore
+            ):
+                count += 1
+                yield question
         
-        return VCQABattle(questions=questions[:3])  # Limit to 3 questions
+        # Add distinct general tough questions if we need more
+        for question in self._generate_general_tough_questions(3 - count):
+            yield question
     
     def _identify_weak_areas(self, deck_summary: DeckSummary) -> List[str]:
         """Identify the weakest areas in the pitch deck."""
-        element_scores = {
-            "traction": (deck_summary.traction.clarity_score + deck_summary.traction.completeness_score) / 2,
-            "business_model": (deck_summary.business_model.clarity_score + deck_summary.business_model.completeness_score) / 2,
-            "competition": (deck_summary.competition.clarity_score + deck_summary.competition.completeness_score) / 2,
-            "financials": (deck_summary.financials.clarity_score + deck_summary.financials.completeness_score) / 2,
-            "market": (deck_summary.market.clarity_score + deck_summary.market.completeness_score) / 2,
-            "team": (deck_summary.team.clarity_score + deck_summary.team.completeness_score) / 2
-        }
-        
-        # Sort by score (lowest first)
-        sorted_areas = sorted(element_scores.items(), key=lambda x: x[1])
-        return [area[0] for area in sorted_areas if area[1] < 7.0]  # Only include weak areas
-    
-    def _generate_question_for_area(self, area: str, pitch_content: str, deck_summary: DeckSummary) -> QAItem:
-        """Generate a tough question for a specific weak area."""
-        
-        area_prompts = {
-            "traction": """
-            Generate a tough VC question about traction and user validation.
-            Focus on metrics, growth rates, user retention, and proof of product-market fit.
-            """,
-            "business_model": """
-            Generate a tough VC question about the business model and monetization.
-            Focus on unit economics, revenue streams, pricing strategy, and scalability.
-            """,
-            "competition": """
-            Generate a tough VC question about competitive landscape and differentiation.
-            Focus on competitive advantages, market positioning, and defensibility.
-            """,
-            "financials": """
-            Generate a tough VC question about financial projections and funding.
-            Focus on burn rate, runway, revenue assumptions, and path to profitability.
-            """,
-            "market": """
-            Generate a tough VC question about market size and opportunity.
-            Focus on TAM/SAM/SOM, market validation, and go-to-market strategy.
-            """,
-            "team": """
-            Generate a tough VC question about the founding team and execution capability.
-            Focus on relevant experience, skill gaps, and ability to scale.
-            """
-        }
-        
-        prompt = f"""
-        {area_prompts.get(area, "Generate a tough VC question about this startup.")}
-        
-        PITCH CONTEXT:
-        {pitch_content}
+        # Only weak areas (< 7.0) are kept, so only those get sorted
+        weak = [
+            (score, name)
+            for name in _DECK_ELEMENTS
+            for element in (getattr(deck_summary, name),)
+            for score in ((element.clarity_score + element.completeness_score) * 0.5,)
+            if score < 7.0
+        ]
         
-        SPECIFIC AREA CONTENT:
-        {getattr(deck_summary, area).content}
+        # Lowest first; the sort is stable, so ties stay in _DECK_ELEMENTS order
+        weak.sort(key=itemgetter(0))
+        return [name for score, name in weak]
+    
+    def _pitch_model(self, pitch_content: str) -> Tuple[Any, str]:
+        """Return (model, prompt prefix), reusing a context cache of the pitch when possible."""
+        key = hashlib.sha256(pitch_content.encode()).hexdigest()
+        now = time.time()
         
-        Generate:
-        1. A specific, challenging question that a VC would ask
-        2. An ideal founder response that addresses the concern
-        3. Difficulty level (Easy/Medium/Hard)
-        4. Category name
+        with _PITCH_CACHES_LOCK:
+            for expired in [k for k, (_, expires) in _PITCH_CACHES.items() if expires <= now]:
+                del _PITCH_CACHES[expired]
+            entry = _PITCH_CACHES.get(key)
         
-        Format:
-        QUESTION: [The tough question]
-        RESPONSE: [Ideal founder response]
-        DIFFICULTY: [Easy/Medium/Hard]
-        CATEGORY: [Category name]
+        if entry is None:
+            cached = create_context_cache([pitch_content], ttl_seconds=config.QA_CONTEXT_CACHE_TTL_SECONDS)
+            if cached is not None:
+                # Stop handing it out a little before the server-side TTL runs out
+                entry = (cached, now + config.QA_CONTEXT_CACHE_TTL_SECONDS - 30)
+                with _PITCH_CACHES_LOCK:
+                    _PITCH_CACHES[key] = entry
         
-        Make the question realistic and the response demonstrate deep thinking.
-        """
+        if entry is not None:
+            return genai.GenerativeModel.from_cached_content(cached_content=entry[0]), ""
+        return self.model, f"PITCH CONTEXT:\n{pitch_content}\n\n"
+    
+    async def _stream_questions_for_areas(self, areas: List[str], deck_summary: DeckSummary,
+                                          model, prefix: str, pitch_digest: str,
+                                          semaphore: Optional[asyncio.Semaphore] = None) -> AsyncIterator[QAItem]:
+        """Yield one tough question per weak area from a single streamed, structured request."""
+        
+        sections = "\n".join(
+            self._AREA_SECTION_TMPL.format_map({
+                "area": area,
+                "area_prompt": self._AREA_PROMPTS.get(area, self._DEFAULT_AREA_PROMPT).strip(),
+                "area_content": getattr(deck_summary, area).content
+            })
+            for area in areas
+        )
+        task = self._QUESTIONS_TMPL.format_map({"sections": sections})
         
+        answered: Set[str] = set()
         try:
-            response = self.model.generate_content(prompt)
-            return self._parse_qa_response(response.text, area)
+            cache_key = _response_key(pitch_digest, task)
+            text = _get_cached_response(cache_key)
+            if text is not None:
+                for item in json.loads(text):
+                    question = self._question_from_item(item, areas, answered)
+                    if question is not None:
+                        yield question
+            else:
+                if semaphore is not None:
+                    await semaphore.acquire()
+                try:
+                    response = await model.generate_content_async(prefix + task, generation_config={
+                        "response_mime_type": "application/json",
+                        "response_schema": list[_QAItemSchema]
+                    }, stream=True)
+                    chunks = []
+                    async for item in self._iter_json_items(response, chunks):
+                        question = self._question_from_item(item, areas, answered)
+                        if question is not None:
+                            yield question
+                finally:
+                    if semaphore is not None:
+                        semaphore.release()
+                text = "".join(chunks)
+                json.loads(text)
+                _store_response(cache_key, text)  # Only memoize responses that parse
         except Exception:
-            return self._get_fallback_question(area)
-    
-    def _generate_general_tough_question(self, pitch_content: str) -> QAItem:
-        """Generate a general tough VC question."""
-        
-        general_questions = [
-            {
-                "question": "What's your biggest assumption that could kill this business if it's wrong?",
-                "response": "Our biggest assumption is that enterprises will pay premium prices for our solution. We're mitigating this risk through pilot programs with 5 Fortune 500 companies, and early feedback validates our pricing model.",
-                "difficulty": "Hard",
-                "category": "Risk Assessment"
-            },
-            {
-                "question": "How do you plan to defend against Google or Amazon entering this space?",
-                "response": "While big tech could build similar features, our advantage lies in our specialized focus and deep customer relationships. We're building network effects and data moats that become stronger over time.",
-                "difficulty": "Hard",
-                "category": "Competition"
-            },
-            {
-                "question": "What happens if your key technical co-founder leaves tomorrow?",
-                "response": "We've built redundancy into our technical leadership with documented processes and cross-training. Our CTO has also helped us build a strong engineering culture that can continue executing our roadmap.",
-                "difficulty": "Medium",
-                "category": "Team Risk"
-            }
-        ]
+            pass
         
-        import random
-        selected = random.choice(general_questions)
-        
-        return QAItem(
-            question=selected["question"],
-            ideal_response=selected["response"],
-            difficulty_level=selected["difficulty"],
-            category=selected["category"]
-        )
+        # Areas the response missed or garbled
+        for area in areas:
+            if area not in answered:
+                yield self._get_fallback_question(area)
     
-    def _parse_qa_response(self, response_text: str, area: str) -> QAItem:
-        """Parse AI response into QAItem."""
-        lines = response_text.strip().split('\n')
-        
-        question = f"How do you address concerns about {area}?"
-        response = "We have a comprehensive strategy to address this area."
-        difficulty = "Medium"
-        category = area.title()
-        
-        for line in lines:
-            line = line.strip()
-            if line.startswith("QUESTION:"):
-                question = line.replace("QUESTION:", "").strip()
-            elif line.startswith("RESPONSE:"):
-                response = line.replace("RESPONSE:", "").strip()
-            elif line.startswith("DIFFICULTY:"):
-                difficulty = line.replace("DIFFICULTY:", "").strip()
-            elif line.startswith("CATEGORY:"):
-                category = line.replace("CATEGORY:", "").strip()
+    async def _iter_json_items(self, response, chunks: List[str]) -> AsyncIterator[Dict[str, Any]]:
+        """Yield the objects of a streamed JSON array, each as soon as it closes when ijson is available."""
+        if ijson is None:
+            chunks.extend([chunk.text async for chunk in response])
+            for item in json.loads("".join(chunks)):
+                yield item
+            return
         
-        return QAItem(
-            question=question,
-            ideal_response=response,
-            difficulty_level=difficulty,
-            category=category
-        )
+        items = ijson.sendable_list()
+        parser = ijson.items_coro(items, 'item')
+        async for chunk in response:
+            chunks.append(chunk.text)
+            parser.send(chunk.text.encode())
+            for item in items:
+                yield item
+            del items[:]
+        parser.close()
+        for item in items:
+            yield item
+    
+    def _question_from_item(self, item: Dict[str, Any], areas: List[str], answered: Set[str]) -> Optional[QAItem]:
+        """Build a QAItem from one response object, or None if it is malformed or repeats an area."""
+        area = item.get("area")
+        if area not in areas or area in answered:
+            return None
+        try:
+            question = QAItem(
+                question=item["question"],
+                ideal_response=item["ideal_response"],
+                difficulty_level=item["difficulty_level"],
+                category=item["category"]
+            )
+        except Exception:
+            return None
+        answered.add(area)
+        return question
+    
+    def _generate_general_tough_questions(self, count: int) -> List[QAItem]:
+        """Draw up to count distinct general tough VC questions."""
+        return random.sample(self._GENERAL_QUESTIONS, max(0, min(count, len(self._GENERAL_QUESTIONS))))
     
     def _get_fallback_question(self, area: str) -> QAItem:
         """Get fallback question when AI fails."""
-        fallback_questions = {
-            "traction": {
-                "question": "What metrics prove you have product-market fit?",
-                "response": "Our key metrics show strong PMF: 40% month-over-month growth, 85% user retention, and NPS of 72.",
-                "difficulty": "Medium",
-                "category": "Traction"
-            },
-            "business_model": {
-                "question": "How do your unit economics work at scale?",
-                "response": "Our LTV:CAC ratio is 4:1 with a 14-month payback period, improving as we scale due to operational leverage.",
-                "difficulty": "Hard",
-                "category": "Business Model"
-            },
-            "competition": {
-                "question": "What's your sustainable competitive advantage?",
-                "response": "Our network effects and proprietary data create increasing returns to scale that competitors can't easily replicate.",
-                "difficulty": "Medium",
-                "category": "Competition"
-            }
-        }
-        
-        fallback = fallback_questions.get(area, {
-            "question": f"How do you plan to improve your {area}?",
-            "response": f"We have a detailed strategy to strengthen our {area} through focused execution.",
-            "difficulty": "Medium",
-            "category": area.title()
-        })
-        
-        return QAItem(**fallback)
+        fallback = self._FALLBACK_QUESTIONS.get(area)
+        if fallback is not None:
+            return fallback
+        
+        return QAItem(
+            question=f"How do you plan to improve your {area}?",
+            ideal_response=f"We have a detailed strategy to strengthen our {area} through focused execution.",
+            difficulty_level="Medium",
+            category=area.title()
+        )
@@ -120,6 +120,26 @@ def test_sample_analysis():
     except Exception as e:
         print(f"❌ Analysis test failed: {e}")
 
+def test_hype_terms():
+    """Test that every configured hype term is counted by the hype meter."""
+    print("\nTesting hype term matching...")
+    
+    try:
+        from src.config import config
+        from src.pitch_analyzer import _HYPE_RE
+        
+        for term in config.HYPE_TERMS:
+            text = f"our {term} platform".lower()
+            assert _HYPE_RE.findall(text) == [term.lower()], term
+        
+        # Terms are counted as whole words only
+        assert _HYPE_RE.findall("leveraged unscalable") == []
+        
+        print("✅ Hype term tests passed")
+        
+    except Exception as e:
+        print(f"❌ Hype term test failed: {e}")
+
 def test_file_processor():
     """Test file processing capabilities."""
     print("\nTesting file processor...")
@@ -162,6 +182,9 @@ def main():
     # Test file processor
     test_file_processor()
     
+    # Test hype term matching
+    test_hype_terms()
+    
     # Test sample analysis
     test_sample_analysis()
     